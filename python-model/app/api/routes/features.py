@@ -2,11 +2,46 @@
 Feature retrieval endpoints.
 """
 from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from typing import Optional
 
+from app.features.line_movement import LineMovementFeatures, calculate_line_movement_features
+from app.serving.prob_cache import ProbCache
+
 router = APIRouter()
 
+# Line movement bundles for games polled repeatedly during live odds updates
+_line_movement_cache = ProbCache(p=0.3)
+
+
+def cached_feature_bundle(
+    game_id: str,
+    opening_spread: Optional[float],
+    current_spread: Optional[float],
+    opening_total: Optional[float] = None,
+    current_total: Optional[float] = None,
+) -> LineMovementFeatures:
+    """
+    Line movement features for a game, probabilistically cached.
+
+    Args:
+        game_id: Game identifier
+        opening_spread: Opening spread
+        current_spread: Current/closing spread
+        opening_total: Opening total
+        current_total: Current/closing total
+
+    Returns:
+        LineMovementFeatures for the game
+    """
+    key = (game_id, opening_spread, current_spread, opening_total, current_total)
+    return _line_movement_cache.get_or_compute(
+        key,
+        lambda: calculate_line_movement_features(
+            opening_spread, current_spread, opening_total, current_total
+        ),
+    )
+
 
 class TeamFeaturesResponse(BaseModel):
     """Response model for team features."""
@@ -40,6 +75,21 @@ class TeamFeaturesResponse(BaseModel):
     top_5_bpm: Optional[float]
 
 
+class LineMovementFeaturesResponse(BaseModel):
+    """Response model for a game's line movement features."""
+    model_config = ConfigDict(frozen=True)
+
+    game_id: str
+    opening_spread: float
+    current_spread: float
+    spread_movement: float
+    spread_direction: str
+    opening_total: float
+    current_total: float
+    total_movement: float
+    implied_prob_shift: float
+
+
 class FeatureImportanceResponse(BaseModel):
     """Response model for feature importance."""
     features: dict[str, float]
@@ -62,6 +112,28 @@ async def get_team_features(team_id: str, season: Optional[int] = None):
     )
 
 
+@router.get("/line-movement/{game_id}", response_model=LineMovementFeaturesResponse)
+async def get_line_movement_features(
+    game_id: str,
+    opening_spread: Optional[float] = None,
+    current_spread: Optional[float] = None,
+    opening_total: Optional[float] = None,
+    current_total: Optional[float] = None,
+) -> LineMovementFeaturesResponse:
+    """
+    Get line movement features for a game from its opening and current lines.
+
+    Results for games polled repeatedly are served from a probabilistic cache.
+    """
+    features = cached_feature_bundle(
+        game_id, opening_spread, current_spread, opening_total, current_total
+    )
+    return LineMovementFeaturesResponse(
+        game_id=game_id,
+        **features._replace(implied_prob_shift=round(features.implied_prob_shift, 4))._asdict(),
+    )
+
+
 @router.get("/importance", response_model=FeatureImportanceResponse)
 async def get_feature_importance():
     """
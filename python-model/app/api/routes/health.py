@@ -2,8 +2,9 @@
 Health check endpoints.
 """
 from fastapi import APIRouter, Request
+from fastapi.responses import PlainTextResponse
 from pydantic import BaseModel
-from datetime import datetime
+from datetime import datetime, timezone
 
 from app.config import get_settings
 
@@ -41,7 +42,7 @@ async def health_check(request: Request) -> HealthResponse:
         version=settings.app_version,
         model_loaded=model is not None,
         model_version=settings.model_version if model else None,
-        timestamp=datetime.utcnow(),
+        timestamp=datetime.now(timezone.utc),
     )
 
 
@@ -64,10 +65,11 @@ async def readiness_check(request: Request) -> ReadinessResponse:
     )
 
 
-@router.get("/health/live")
-async def liveness_check():
+@router.get("/health/live", response_class=PlainTextResponse)
+async def liveness_check() -> str:
     """
     Liveness check for Kubernetes.
-    Simple check that the service is running.
+    Simple check that the service is running; returns plain "OK"
+    without JSON encoding or response-model validation.
     """
-    return {"alive": True}
+    return "OK"
@@ -1,18 +1,31 @@
 """
 Prediction endpoints for XGBoost NBA model.
 """
-from fastapi import APIRouter, Request, HTTPException
-from pydantic import BaseModel, Field
+import asyncio
+
+from fastapi import APIRouter, Depends, Request, HTTPException
+from fastapi.exceptions import RequestValidationError
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, ValidationError
 from typing import Optional
-from datetime import datetime
+from datetime import datetime, timezone
+from functools import lru_cache
+from operator import itemgetter
+
+import numpy as np
 
 from app.config import get_settings
-from app.models.xgboost_model import XGBoostNBAModel
-from app.features.adjusted_rating import calculate_adjusted_ratings
-from app.features.four_factors import calculate_four_factors_differential
-from app.features.pace_metrics import calculate_pace_metrics
+from app.models.xgboost_model import XGBoostNBAModel, FEATURE_ORDER
+from app.features.adjusted_rating import calculate_adjusted_ratings, calculate_adjusted_ratings_vec
+from app.features.four_factors import (
+    calculate_four_factors_differential,
+    calculate_four_factors_differential_vec,
+)
+from app.features.pace_metrics import calculate_pace_metrics, project_game_pace_vec
 from app.features.player_impact import calculate_bpm_differential
-from app.features.line_movement import calculate_line_movement_features
+from app.features.line_movement import (
+    calculate_line_movement_features,
+    calculate_line_movement_features_vec,
+)
 
 router = APIRouter()
 settings = get_settings()
@@ -20,6 +33,8 @@ settings = get_settings()
 
 class TeamFeatures(BaseModel):
     """Input features for a single team."""
+    model_config = ConfigDict(extra="ignore", validate_assignment=False)
+
     team_id: str
     team_name: str
 
@@ -51,6 +66,8 @@ class TeamFeatures(BaseModel):
 
 class PredictionRequest(BaseModel):
     """Request model for single game prediction."""
+    model_config = ConfigDict(extra="ignore", validate_assignment=False)
+
     game_id: str
     home_team: TeamFeatures
     away_team: TeamFeatures
@@ -66,8 +83,8 @@ class PredictionRequest(BaseModel):
     home_sos_drtg: Optional[float] = Field(None, description="Home team SOS defensive rating")
     away_sos_ortg: Optional[float] = Field(None, description="Away team SOS offensive rating")
     away_sos_drtg: Optional[float] = Field(None, description="Away team SOS defensive rating")
-    league_avg_ortg: Optional[float] = Field(110.0, description="League average ORTG")
-    league_avg_drtg: Optional[float] = Field(110.0, description="League average DRTG")
+    league_avg_ortg: float = Field(110.0, description="League average ORTG")
+    league_avg_drtg: float = Field(110.0, description="League average DRTG")
 
 
 class PredictionResponse(BaseModel):
@@ -84,12 +101,14 @@ class PredictionResponse(BaseModel):
     predicted_away_score: Optional[float] = None
     confidence: float
     model_version: str
-    feature_vector: dict
+    feature_vector: dict = Field(default_factory=dict)  # only with include_features
     generated_at: datetime
 
 
 class BatchPredictionRequest(BaseModel):
     """Request model for batch predictions."""
+    model_config = ConfigDict(extra="ignore", validate_assignment=False)
+
     games: list[PredictionRequest]
 
 
@@ -100,10 +119,67 @@ class BatchPredictionResponse(BaseModel):
     model_version: str
 
 
-def build_feature_vector(request: PredictionRequest) -> dict:
+# Validates a whole batch body in one pydantic-core pass (JSON parsing included)
+_BATCH_ADAPTER = TypeAdapter(BatchPredictionRequest)
+
+# The batch body is read manually, so describe it for the OpenAPI docs.
+# Nested models are registered as components by the single-game endpoint.
+_BATCH_SCHEMA = BatchPredictionRequest.model_json_schema(
+    ref_template="#/components/schemas/{model}"
+)
+_BATCH_SCHEMA.pop("$defs", None)
+
+# Decimal places for echoed features; features are computed unrounded and
+# only rounded here, at the response boundary (default 2)
+FEATURE_PRECISION = {
+    "adj_nrtg_diff": 1,
+    "home_adj_ortg": 1,
+    "home_adj_drtg": 1,
+    "away_adj_ortg": 1,
+    "away_adj_drtg": 1,
+    "efg_diff": 4,
+    "tov_diff": 4,
+    "oreb_diff": 4,
+    "ftr_diff": 4,
+    "def_efg_diff": 4,
+    "def_tov_diff": 4,
+    "def_oreb_diff": 4,
+    "def_ftr_diff": 4,
+    "four_factors_composite": 4,
+    "pace_diff": 1,
+    "projected_game_pace": 1,
+}
+
+
+def _round_for_response(features: dict, precision: dict) -> dict:
+    """Round feature values for a human-readable JSON response."""
+    return {k: round(v, precision.get(k, 2)) for k, v in features.items()}
+
+
+def get_model(req: Request) -> XGBoostNBAModel:
+    """
+    Dependency returning the loaded model.
+
+    Raises:
+        HTTPException: 503 if no model is loaded
+    """
+    model = getattr(req.app.state, "model", None)
+    if model is None:
+        raise HTTPException(
+            status_code=503,
+            detail="Model not loaded. Please train the model first.",
+        )
+    return model
+
+
+def build_feature_vector(request: PredictionRequest) -> np.ndarray:
     """
     Build the 20-feature vector from the request data.
 
+    Returns a float array in FEATURE_ORDER (the model's input row);
+    map it back to names with dict(zip(FEATURE_ORDER, ...)) only when
+    a dict is needed for the response.
+
     Features:
     1. adj_nrtg_diff - Adjusted net rating differential
     2. home_adj_ortg - Home team adjusted offensive rating
@@ -126,113 +202,298 @@ def build_feature_vector(request: PredictionRequest) -> dict:
     19. spread_movement - Line movement (current - opening)
     20. opening_spread - Opening spread value
     """
-    home = request.home_team
-    away = request.away_team
+    # Read fields straight from the validated models' __dict__, skipping
+    # per-attribute descriptor lookups
+    features = _build_feature_vector_cached(
+        _team_values(request.home_team.__dict__),
+        _team_values(request.away_team.__dict__),
+        _line_values(request.__dict__),
+        _sos_values(request.__dict__),
+    )
+    return np.array(features, dtype=np.float64)
+
+
+# Team fields that feed the feature vector, in the order packed into cache keys
+_TEAM_FIELDS = (
+    "off_rating",
+    "def_rating",
+    "pace",
+    "efg_pct",
+    "tov_pct",
+    "oreb_pct",
+    "ftr",
+    "opp_efg_pct",
+    "opp_tov_pct",
+    "opp_oreb_pct",
+    "opp_ftr",
+    "adj_off_rating",
+    "adj_def_rating",
+    "team_bpm",
+    "top_5_bpm",
+)
+_team_values = itemgetter(*_TEAM_FIELDS)
+_line_values = itemgetter("opening_spread", "current_spread")
+_sos_values = itemgetter(
+    "home_sos_ortg",
+    "home_sos_drtg",
+    "away_sos_ortg",
+    "away_sos_drtg",
+    "league_avg_ortg",
+    "league_avg_drtg",
+)
+
+
+@lru_cache(maxsize=4096)
+def _build_feature_vector_cached(
+    home: tuple,
+    away: tuple,
+    line: tuple,
+    sos: tuple,
+) -> tuple[float, ...]:
+    """
+    Compute the feature vector from hashable inputs.
+
+    Memoized so repeated requests for the same matchup (backtests,
+    polling clients) skip the feature pipeline entirely.
+
+    Args:
+        home: Home team values in _TEAM_FIELDS order
+        away: Away team values in _TEAM_FIELDS order
+        line: (opening_spread, current_spread)
+        sos: (home_sos_ortg, home_sos_drtg, away_sos_ortg, away_sos_drtg,
+              league_avg_ortg, league_avg_drtg)
+
+    Returns:
+        Feature values in FEATURE_ORDER
+    """
+    (
+        h_ortg, h_drtg, h_pace,
+        h_efg, h_tov, h_oreb, h_ftr,
+        h_opp_efg, h_opp_tov, h_opp_oreb, h_opp_ftr,
+        h_adj_ortg, h_adj_drtg, h_bpm, h_top_5_bpm,
+    ) = home
+    (
+        a_ortg, a_drtg, a_pace,
+        a_efg, a_tov, a_oreb, a_ftr,
+        a_opp_efg, a_opp_tov, a_opp_oreb, a_opp_ftr,
+        a_adj_ortg, a_adj_drtg, a_bpm, a_top_5_bpm,
+    ) = away
+    opening_spread, current_spread = line
+    h_sos_ortg, h_sos_drtg, a_sos_ortg, a_sos_drtg, league_avg_ortg, league_avg_drtg = sos
 
     # Calculate adjusted ratings if not provided
     adj_ratings = calculate_adjusted_ratings(
-        home_ortg=home.off_rating,
-        home_drtg=home.def_rating,
-        away_ortg=away.off_rating,
-        away_drtg=away.def_rating,
-        home_sos_ortg=request.home_sos_ortg,
-        home_sos_drtg=request.home_sos_drtg,
-        away_sos_ortg=request.away_sos_ortg,
-        away_sos_drtg=request.away_sos_drtg,
-        league_avg_ortg=request.league_avg_ortg or 110.0,
-        league_avg_drtg=request.league_avg_drtg or 110.0,
-        home_adj_ortg=home.adj_off_rating,
-        home_adj_drtg=home.adj_def_rating,
-        away_adj_ortg=away.adj_off_rating,
-        away_adj_drtg=away.adj_def_rating,
+        home_ortg=h_ortg,
+        home_drtg=h_drtg,
+        away_ortg=a_ortg,
+        away_drtg=a_drtg,
+        home_sos_ortg=h_sos_ortg,
+        home_sos_drtg=h_sos_drtg,
+        away_sos_ortg=a_sos_ortg,
+        away_sos_drtg=a_sos_drtg,
+        league_avg_ortg=league_avg_ortg,
+        league_avg_drtg=league_avg_drtg,
+        home_adj_ortg=h_adj_ortg,
+        home_adj_drtg=h_adj_drtg,
+        away_adj_ortg=a_adj_ortg,
+        away_adj_drtg=a_adj_drtg,
     )
 
     # Calculate four factors differentials
     four_factors = calculate_four_factors_differential(
-        home_efg=home.efg_pct,
-        home_tov=home.tov_pct,
-        home_oreb=home.oreb_pct,
-        home_ftr=home.ftr,
-        home_opp_efg=home.opp_efg_pct,
-        home_opp_tov=home.opp_tov_pct,
-        home_opp_oreb=home.opp_oreb_pct,
-        home_opp_ftr=home.opp_ftr,
-        away_efg=away.efg_pct,
-        away_tov=away.tov_pct,
-        away_oreb=away.oreb_pct,
-        away_ftr=away.ftr,
-        away_opp_efg=away.opp_efg_pct,
-        away_opp_tov=away.opp_tov_pct,
-        away_opp_oreb=away.opp_oreb_pct,
-        away_opp_ftr=away.opp_ftr,
+        home_efg=h_efg,
+        home_tov=h_tov,
+        home_oreb=h_oreb,
+        home_ftr=h_ftr,
+        home_opp_efg=h_opp_efg,
+        home_opp_tov=h_opp_tov,
+        home_opp_oreb=h_opp_oreb,
+        home_opp_ftr=h_opp_ftr,
+        away_efg=a_efg,
+        away_tov=a_tov,
+        away_oreb=a_oreb,
+        away_ftr=a_ftr,
+        away_opp_efg=a_opp_efg,
+        away_opp_tov=a_opp_tov,
+        away_opp_oreb=a_opp_oreb,
+        away_opp_ftr=a_opp_ftr,
     )
 
     # Calculate pace metrics
-    pace = calculate_pace_metrics(home.pace, away.pace)
+    pace = calculate_pace_metrics(h_pace, a_pace)
 
     # Calculate BPM differentials
     bpm = calculate_bpm_differential(
-        home_bpm=home.team_bpm,
-        away_bpm=away.team_bpm,
-        home_top_5_bpm=home.top_5_bpm,
-        away_top_5_bpm=away.top_5_bpm,
+        home_bpm=h_bpm,
+        away_bpm=a_bpm,
+        home_top_5_bpm=h_top_5_bpm,
+        away_top_5_bpm=a_top_5_bpm,
     )
 
     # Calculate line movement features
-    line = calculate_line_movement_features(
-        opening_spread=request.opening_spread,
-        current_spread=request.current_spread,
+    line_features = calculate_line_movement_features(
+        opening_spread=opening_spread,
+        current_spread=current_spread,
     )
 
-    return {
+    return (
         # Adjusted ratings (1-5)
+        adj_ratings.adj_nrtg_diff,
+        adj_ratings.home_adj_ortg,
+        adj_ratings.home_adj_drtg,
+        adj_ratings.away_adj_ortg,
+        adj_ratings.away_adj_drtg,
+        # Four factors offense (6-9)
+        four_factors.efg_diff,
+        four_factors.tov_diff,
+        four_factors.oreb_diff,
+        four_factors.ftr_diff,
+        # Four factors defense (10-13)
+        four_factors.def_efg_diff,
+        four_factors.def_tov_diff,
+        four_factors.def_oreb_diff,
+        four_factors.def_ftr_diff,
+        # Four factors composite (14)
+        four_factors.composite,
+        # Pace (15-16)
+        pace.pace_diff,
+        pace.projected_pace,
+        # BPM (17-18)
+        bpm.bpm_diff,
+        bpm.top_5_bpm_diff,
+        # Line movement (19-20)
+        line_features.spread_movement,
+        line_features.opening_spread,
+    )
+
+
+def _column(items: list, name: str) -> np.ndarray:
+    """Gather one numeric field across a batch into a float array (None -> NaN)."""
+    return np.array([getattr(item, name) for item in items], dtype=np.float64)
+
+
+def build_feature_matrix(games: list[PredictionRequest]) -> np.ndarray:
+    """
+    Build the (n_games, 20) feature matrix for a batch of games.
+
+    Vectorized equivalent of build_feature_vector: each input field is
+    gathered into one array and every differential is computed with
+    NumPy across the whole batch. Columns follow FEATURE_ORDER.
+
+    Args:
+        games: Prediction requests
+
+    Returns:
+        Feature matrix with one row per game
+    """
+    homes = [g.home_team for g in games]
+    aways = [g.away_team for g in games]
+
+    def home(name: str) -> np.ndarray:
+        return _column(homes, name)
+
+    def away(name: str) -> np.ndarray:
+        return _column(aways, name)
+
+    def game(name: str) -> np.ndarray:
+        return _column(games, name)
+
+    adj_ratings = calculate_adjusted_ratings_vec(
+        home_ortg=home("off_rating"),
+        home_drtg=home("def_rating"),
+        away_ortg=away("off_rating"),
+        away_drtg=away("def_rating"),
+        home_sos_ortg=game("home_sos_ortg"),
+        home_sos_drtg=game("home_sos_drtg"),
+        away_sos_ortg=game("away_sos_ortg"),
+        away_sos_drtg=game("away_sos_drtg"),
+        league_avg_ortg=game("league_avg_ortg"),
+        league_avg_drtg=game("league_avg_drtg"),
+        home_adj_ortg=home("adj_off_rating"),
+        home_adj_drtg=home("adj_def_rating"),
+        away_adj_ortg=away("adj_off_rating"),
+        away_adj_drtg=away("adj_def_rating"),
+    )
+
+    four_factors = calculate_four_factors_differential_vec(
+        home_efg=home("efg_pct"),
+        home_tov=home("tov_pct"),
+        home_oreb=home("oreb_pct"),
+        home_ftr=home("ftr"),
+        home_opp_efg=home("opp_efg_pct"),
+        home_opp_tov=home("opp_tov_pct"),
+        home_opp_oreb=home("opp_oreb_pct"),
+        home_opp_ftr=home("opp_ftr"),
+        away_efg=away("efg_pct"),
+        away_tov=away("tov_pct"),
+        away_oreb=away("oreb_pct"),
+        away_ftr=away("ftr"),
+        away_opp_efg=away("opp_efg_pct"),
+        away_opp_tov=away("opp_tov_pct"),
+        away_opp_oreb=away("opp_oreb_pct"),
+        away_opp_ftr=away("opp_ftr"),
+    )
+
+    # Pace
+    home_pace = home("pace")
+    away_pace = away("pace")
+    pace_diff = home_pace - away_pace
+    projected_pace = project_game_pace_vec(home_pace, away_pace)
+
+    # BPM (missing team BPM counts as 0; top-5 diff requires both sides)
+    bpm_diff = np.nan_to_num(home("team_bpm")) - np.nan_to_num(away("team_bpm"))
+    top_5_bpm_diff = np.nan_to_num(home("top_5_bpm") - away("top_5_bpm"))
+
+    # Line movement (missing spreads count as no movement)
+    line_features = calculate_line_movement_features_vec(
+        opening_spread=game("opening_spread"),
+        current_spread=game("current_spread"),
+    )
+
+    columns = {
         "adj_nrtg_diff": adj_ratings["adj_nrtg_diff"],
         "home_adj_ortg": adj_ratings["home_adj_ortg"],
         "home_adj_drtg": adj_ratings["home_adj_drtg"],
         "away_adj_ortg": adj_ratings["away_adj_ortg"],
         "away_adj_drtg": adj_ratings["away_adj_drtg"],
-        # Four factors offense (6-9)
         "efg_diff": four_factors["efg_diff"],
         "tov_diff": four_factors["tov_diff"],
         "oreb_diff": four_factors["oreb_diff"],
         "ftr_diff": four_factors["ftr_diff"],
-        # Four factors defense (10-13)
         "def_efg_diff": four_factors["def_efg_diff"],
         "def_tov_diff": four_factors["def_tov_diff"],
         "def_oreb_diff": four_factors["def_oreb_diff"],
         "def_ftr_diff": four_factors["def_ftr_diff"],
-        # Four factors composite (14)
         "four_factors_composite": four_factors["composite"],
-        # Pace (15-16)
-        "pace_diff": pace["pace_diff"],
-        "projected_game_pace": pace["projected_pace"],
-        # BPM (17-18)
-        "bpm_diff": bpm["bpm_diff"],
-        "top_5_bpm_diff": bpm["top_5_bpm_diff"],
-        # Line movement (19-20)
-        "spread_movement": line["spread_movement"],
-        "opening_spread": line["opening_spread"],
+        "pace_diff": pace_diff,
+        "projected_game_pace": projected_pace,
+        "bpm_diff": bpm_diff,
+        "top_5_bpm_diff": top_5_bpm_diff,
+        "spread_movement": line_features["spread_movement"],
+        "opening_spread": line_features["opening_spread"],
     }
 
+    return np.column_stack([columns[name] for name in FEATURE_ORDER])
+
 
 @router.post("/", response_model=PredictionResponse)
-async def predict_game(request: PredictionRequest, req: Request) -> PredictionResponse:
+async def predict_game(
+    request: PredictionRequest,
+    req: Request,
+    include_features: bool = False,
+    model: XGBoostNBAModel = Depends(get_model),
+) -> PredictionResponse:
     """
     Generate prediction for a single game.
-    """
-    model: XGBoostNBAModel | None = getattr(req.app.state, "model", None)
-
-    if model is None:
-        raise HTTPException(
-            status_code=503,
-            detail="Model not loaded. Please train the model first.",
-        )
 
+    Pass include_features=true to echo the model's feature vector.
+    """
     # Build feature vector
     feature_vector = build_feature_vector(request)
 
-    # Get prediction from model
-    prediction = model.predict(feature_vector)
+    # Get prediction from model (batched with other concurrent requests)
+    future = await req.app.state.batcher.submit(feature_vector)
+    prediction = await future
 
     return PredictionResponse(
         game_id=request.game_id,
@@ -249,29 +510,64 @@ async def predict_game(request: PredictionRequest, req: Request) -> PredictionRe
         predicted_away_score=prediction.get("predicted_away_score"),
         confidence=prediction["confidence"],
         model_version=settings.model_version,
-        feature_vector=feature_vector,
-        generated_at=datetime.utcnow(),
+        feature_vector=_round_for_response(
+            dict(zip(FEATURE_ORDER, feature_vector.tolist())), FEATURE_PRECISION
+        )
+        if include_features
+        else {},
+        generated_at=datetime.now(timezone.utc),
     )
 
 
-@router.post("/batch", response_model=BatchPredictionResponse)
-async def predict_batch(request: BatchPredictionRequest, req: Request) -> BatchPredictionResponse:
+@router.post(
+    "/batch",
+    response_model=BatchPredictionResponse,
+    openapi_extra={
+        "requestBody": {
+            "content": {"application/json": {"schema": _BATCH_SCHEMA}},
+            "required": True,
+        },
+    },
+)
+async def predict_batch(
+    req: Request,
+    include_features: bool = False,
+    model: XGBoostNBAModel = Depends(get_model),
+) -> BatchPredictionResponse:
     """
     Generate predictions for multiple games in batch.
+
+    Pass include_features=true to echo each game's feature vector.
     """
-    model: XGBoostNBAModel | None = getattr(req.app.state, "model", None)
+    try:
+        request = _BATCH_ADAPTER.validate_json(await req.body())
+    except ValidationError as e:
+        raise RequestValidationError(
+            [{**err, "loc": ("body", *err["loc"])} for err in e.errors(include_url=False)]
+        )
 
-    if model is None:
-        raise HTTPException(
-            status_code=503,
-            detail="Model not loaded. Please train the model first.",
+    games = request.games
+    model_version = settings.model_version
+    if not games:
+        return BatchPredictionResponse(
+            predictions=[],
+            total_games=0,
+            model_version=model_version,
         )
 
-    predictions = []
-    for game_request in request.games:
-        feature_vector = build_feature_vector(game_request)
-        prediction = model.predict(feature_vector)
+    # One feature matrix and one model call for the whole batch
+    feature_matrix = build_feature_matrix(games)
+    batch_predictions = await asyncio.get_running_loop().run_in_executor(
+        req.app.state.infer_pool, model.predict_from_array, feature_matrix
+    )
 
+    # One timestamp for the whole batch
+    generated_at = datetime.now(timezone.utc)
+
+    rows = feature_matrix.tolist() if include_features else [None] * len(games)
+
+    predictions = []
+    for game_request, row, prediction in zip(games, rows, batch_predictions):
         predictions.append(
             PredictionResponse(
                 game_id=game_request.game_id,
@@ -287,14 +583,18 @@ async def predict_batch(request: BatchPredictionRequest, req: Request) -> BatchP
                 predicted_home_score=prediction.get("predicted_home_score"),
                 predicted_away_score=prediction.get("predicted_away_score"),
                 confidence=prediction["confidence"],
-                model_version=settings.model_version,
-                feature_vector=feature_vector,
-                generated_at=datetime.utcnow(),
+                model_version=model_version,
+                feature_vector=_round_for_response(
+                    dict(zip(FEATURE_ORDER, row)), FEATURE_PRECISION
+                )
+                if row is not None
+                else {},
+                generated_at=generated_at,
             )
         )
 
     return BatchPredictionResponse(
         predictions=predictions,
         total_games=len(predictions),
-        model_version=settings.model_version,
+        model_version=model_version,
     )
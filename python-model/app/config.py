@@ -1,10 +1,40 @@
 """
 Configuration settings for the XGBoost NBA Prediction microservice.
 """
+import math
+import os
+
+from pydantic import model_validator
 from pydantic_settings import BaseSettings
 from functools import lru_cache
 from typing import Optional
 
+# Default cap on uvicorn workers; each loads its own copy of the model
+MAX_DEFAULT_WORKERS = 4
+
+
+def available_cpus() -> int:
+    """
+    CPUs this process may actually use.
+
+    Honors the CPU affinity mask and a cgroup v2 quota (container CPU
+    limit), both of which os.cpu_count() ignores.
+    """
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            quota, period = f.read().split()[:2]
+        if quota != "max":
+            cpus = min(cpus, math.ceil(int(quota) / int(period)))
+    except (OSError, ValueError):
+        pass
+
+    return max(1, cpus)
+
 
 class Settings(BaseSettings):
     """Application settings loaded from environment variables."""
@@ -17,17 +47,33 @@ class Settings(BaseSettings):
     # Server
     host: str = "0.0.0.0"
     port: int = 8000
+    uvicorn_workers: int = min(MAX_DEFAULT_WORKERS, available_cpus())
+    uvicorn_loop: str = "uvloop"  # libuv event loop, shipped with uvicorn[standard]
+    uvicorn_http: str = "httptools"
 
     # Database
     database_url: str = "postgresql://localhost:5432/nba_betting"
 
     # Model
-    model_path: str = "models/xgb_nba_v1.json"
+    model_path: str = "models/xgb_nba_v1.ubj"
     model_version: str = "v1.0.0"
 
+    # Micro-batching for single-game predictions
+    batch_max_size: int = 32
+    batch_max_delay_ms: float = 5.0
+
+    # Thread pool for XGBoost inference (keeps the event loop free), per
+    # worker; None splits the available CPUs across uvicorn_workers
+    inference_threads: Optional[int] = None
+
+    # XGBoost device for predictions ("cpu", "cuda", "cuda:<ordinal>")
+    inference_device: str = "cpu"
+
     # Basketball Reference scraping
     bbref_rate_limit: int = 20  # requests per minute
     bbref_base_url: str = "https://www.basketball-reference.com"
+    bbref_cache_dir: str = ".bbref_cache"  # on-disk page cache ("" disables)
+    bbref_cache_ttl: int = 86400  # seconds
 
     # Feature weights (from Dean Oliver's research)
     efg_weight: float = 0.40
@@ -42,6 +88,13 @@ class Settings(BaseSettings):
     # CORS
     cors_origins: list[str] = ["http://localhost:3000", "http://127.0.0.1:3000"]
 
+    @model_validator(mode="after")
+    def _size_inference_threads(self) -> "Settings":
+        """Default inference_threads to this worker's share of the CPUs."""
+        if self.inference_threads is None:
+            self.inference_threads = min(4, max(1, available_cpus() // self.uvicorn_workers))
+        return self
+
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
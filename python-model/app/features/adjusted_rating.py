@@ -8,7 +8,27 @@ Adj_ORTG = Raw_ORTG * (League_Avg_DRTG / SOS_DRTG)
 Adj_DRTG = Raw_DRTG * (League_Avg_ORTG / SOS_ORTG)
 Adj_NRTG = Adj_ORTG - Adj_DRTG
 """
-from typing import Optional
+from math import exp
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+# Home court advantage (~3.5 points = ~3.5 net rating points)
+HOME_COURT_ADVANTAGE = 3.5
+
+# Logistic steepness for NRTG -> win probability
+# (roughly calibrated so 10 NRTG diff ≈ 75% win probability)
+WIN_PROB_K = 0.15
+
+
+class AdjustedRatings(NamedTuple):
+    """Adjusted ratings for a matchup."""
+
+    home_adj_ortg: float
+    home_adj_drtg: float
+    away_adj_ortg: float
+    away_adj_drtg: float
+    adj_nrtg_diff: float
 
 
 def calculate_adjusted_ortg(
@@ -82,7 +102,7 @@ def calculate_adjusted_ratings(
     home_adj_drtg: Optional[float] = None,
     away_adj_ortg: Optional[float] = None,
     away_adj_drtg: Optional[float] = None,
-) -> dict:
+) -> AdjustedRatings:
     """
     Calculate all adjusted ratings for a matchup.
 
@@ -106,18 +126,19 @@ def calculate_adjusted_ratings(
         away_adj_ortg: Pre-computed away adjusted ORTG
         away_adj_drtg: Pre-computed away adjusted DRTG
 
+    Values are left unrounded; round only when presenting them.
+
     Returns:
-        Dictionary with adjusted ratings and differentials
+        AdjustedRatings with adjusted ratings and differentials
     """
-    # Use pre-computed adjusted ratings if available
+    # Pre-computed adjusted ratings, else SOS adjustment, else raw ratings.
+    # SOS formulas are inlined from calculate_adjusted_ortg/drtg.
     if home_adj_ortg is not None and home_adj_drtg is not None:
         h_adj_ortg = home_adj_ortg
         h_adj_drtg = home_adj_drtg
-    # Calculate from SOS if available
     elif home_sos_ortg is not None and home_sos_drtg is not None:
-        h_adj_ortg = calculate_adjusted_ortg(home_ortg, home_sos_drtg, league_avg_drtg)
-        h_adj_drtg = calculate_adjusted_drtg(home_drtg, home_sos_ortg, league_avg_ortg)
-    # Fall back to raw ratings
+        h_adj_ortg = home_ortg * league_avg_drtg / home_sos_drtg if home_sos_drtg > 0 else home_ortg
+        h_adj_drtg = home_drtg * league_avg_ortg / home_sos_ortg if home_sos_ortg > 0 else home_drtg
     else:
         h_adj_ortg = home_ortg
         h_adj_drtg = home_drtg
@@ -127,32 +148,94 @@ def calculate_adjusted_ratings(
         a_adj_ortg = away_adj_ortg
         a_adj_drtg = away_adj_drtg
     elif away_sos_ortg is not None and away_sos_drtg is not None:
-        a_adj_ortg = calculate_adjusted_ortg(away_ortg, away_sos_drtg, league_avg_drtg)
-        a_adj_drtg = calculate_adjusted_drtg(away_drtg, away_sos_ortg, league_avg_ortg)
+        a_adj_ortg = away_ortg * league_avg_drtg / away_sos_drtg if away_sos_drtg > 0 else away_ortg
+        a_adj_drtg = away_drtg * league_avg_ortg / away_sos_ortg if away_sos_ortg > 0 else away_drtg
     else:
         a_adj_ortg = away_ortg
         a_adj_drtg = away_drtg
 
-    # Calculate net ratings
-    h_adj_nrtg = h_adj_ortg - h_adj_drtg
-    a_adj_nrtg = a_adj_ortg - a_adj_drtg
+    return AdjustedRatings(
+        h_adj_ortg,
+        h_adj_drtg,
+        a_adj_ortg,
+        a_adj_drtg,
+        (h_adj_ortg - h_adj_drtg) + HOME_COURT_ADVANTAGE - (a_adj_ortg - a_adj_drtg),
+    )
+
+
+def calculate_adjusted_ratings_vec(
+    home_ortg: np.ndarray,
+    home_drtg: np.ndarray,
+    away_ortg: np.ndarray,
+    away_drtg: np.ndarray,
+    home_sos_ortg: np.ndarray,
+    home_sos_drtg: np.ndarray,
+    away_sos_ortg: np.ndarray,
+    away_sos_drtg: np.ndarray,
+    league_avg_ortg: np.ndarray,
+    league_avg_drtg: np.ndarray,
+    home_adj_ortg: np.ndarray,
+    home_adj_drtg: np.ndarray,
+    away_adj_ortg: np.ndarray,
+    away_adj_drtg: np.ndarray,
+) -> dict[str, np.ndarray]:
+    """
+    Vectorized adjusted ratings for a batch of games.
 
-    # Add home court advantage (~3.5 points = ~3.5 net rating points)
-    home_court_advantage = 3.5
-    adj_nrtg_diff = (h_adj_nrtg + home_court_advantage) - a_adj_nrtg
+    Same selection logic as calculate_adjusted_ratings, applied per game.
+    Every argument is a 1-D array with one entry per game; missing
+    optional values (SOS or pre-computed ratings) are NaN.
+
+    Returns:
+        Dictionary of arrays keyed like the AdjustedRatings fields
+    """
+    h_adj_ortg, h_adj_drtg = _select_adjusted_vec(
+        home_ortg, home_drtg, home_sos_ortg, home_sos_drtg,
+        league_avg_ortg, league_avg_drtg, home_adj_ortg, home_adj_drtg,
+    )
+    a_adj_ortg, a_adj_drtg = _select_adjusted_vec(
+        away_ortg, away_drtg, away_sos_ortg, away_sos_drtg,
+        league_avg_ortg, league_avg_drtg, away_adj_ortg, away_adj_drtg,
+    )
 
     return {
-        "home_adj_ortg": round(h_adj_ortg, 2),
-        "home_adj_drtg": round(h_adj_drtg, 2),
-        "home_adj_nrtg": round(h_adj_nrtg, 2),
-        "away_adj_ortg": round(a_adj_ortg, 2),
-        "away_adj_drtg": round(a_adj_drtg, 2),
-        "away_adj_nrtg": round(a_adj_nrtg, 2),
-        "adj_nrtg_diff": round(adj_nrtg_diff, 2),
-        "home_court_advantage": home_court_advantage,
+        "home_adj_ortg": h_adj_ortg,
+        "home_adj_drtg": h_adj_drtg,
+        "away_adj_ortg": a_adj_ortg,
+        "away_adj_drtg": a_adj_drtg,
+        "adj_nrtg_diff": (h_adj_ortg - h_adj_drtg) + HOME_COURT_ADVANTAGE - (a_adj_ortg - a_adj_drtg),
     }
 
 
+def _select_adjusted_vec(
+    raw_ortg: np.ndarray,
+    raw_drtg: np.ndarray,
+    sos_ortg: np.ndarray,
+    sos_drtg: np.ndarray,
+    league_avg_ortg: np.ndarray,
+    league_avg_drtg: np.ndarray,
+    adj_ortg: np.ndarray,
+    adj_drtg: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Pick pre-computed, SOS-adjusted, or raw ratings for one side of a batch."""
+    has_adj = ~(np.isnan(adj_ortg) | np.isnan(adj_drtg))
+    has_sos = ~(np.isnan(sos_ortg) | np.isnan(sos_drtg))
+
+    # Both branches are evaluated for every game; masked-out lanes may divide by 0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sos_ortg_calc = raw_ortg * league_avg_drtg / sos_drtg
+        sos_drtg_calc = raw_drtg * league_avg_ortg / sos_ortg
+
+    # Pre-computed, else SOS-adjusted (non-positive SOS keeps raw), else raw
+    out_ortg = np.where(
+        has_adj, adj_ortg, np.where(has_sos & (sos_drtg > 0), sos_ortg_calc, raw_ortg)
+    )
+    out_drtg = np.where(
+        has_adj, adj_drtg, np.where(has_sos & (sos_ortg > 0), sos_drtg_calc, raw_drtg)
+    )
+    return out_ortg, out_drtg
+
+
 def nrtg_to_spread(nrtg_diff: float) -> float:
     """
     Convert net rating differential to expected point spread.
@@ -182,11 +265,20 @@ def nrtg_to_win_probability(nrtg_diff: float) -> float:
     Returns:
         Home team win probability (0-1)
     """
-    import math
+    return 1 / (1 + exp(-WIN_PROB_K * nrtg_diff))
+
+
+def nrtg_to_win_probability_vec(nrtg_diff: np.ndarray) -> np.ndarray:
+    """
+    Vectorized win probability for a batch of net rating differentials.
+
+    Same logistic as nrtg_to_win_probability, written via tanh so large
+    differentials can't overflow exp.
 
-    # Logistic function with scaling factor
-    # k controls steepness - roughly calibrated so 10 NRTG diff ≈ 75% win probability
-    k = 0.15
-    probability = 1 / (1 + math.exp(-k * nrtg_diff))
+    Args:
+        nrtg_diff: Adjusted net rating differentials (positive = home advantage)
 
-    return round(probability, 4)
+    Returns:
+        Home team win probabilities (0-1)
+    """
+    return 0.5 + 0.5 * np.tanh(0.5 * WIN_PROB_K * np.asarray(nrtg_diff, dtype=np.float64))
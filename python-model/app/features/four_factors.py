@@ -19,10 +19,40 @@ TOV% = TOV / (FGA + 0.44 * FTA + TOV)
 OREB% = OREB / (OREB + Opp_DREB)
 FTR = FTM / FGA
 """
+from typing import NamedTuple
+
+import numpy as np
+
 from app.config import get_settings
 
 settings = get_settings()
 
+# Weights from Dean Oliver's research, resolved once at import
+_EFG_WEIGHT = settings.efg_weight  # 0.40
+_TOV_WEIGHT = settings.tov_weight  # 0.25
+_OREB_WEIGHT = settings.oreb_weight  # 0.20
+_FTR_WEIGHT = settings.ftr_weight  # 0.15
+
+# Constant part of the defensive score: the (1 - opp_x) terms contribute
+# their weights regardless of the inputs
+_DEF_BASELINE = _EFG_WEIGHT + _OREB_WEIGHT + _FTR_WEIGHT
+
+
+class FourFactorsDifferential(NamedTuple):
+    """Four Factors differentials for a matchup (positive favors home)."""
+
+    efg_diff: float
+    tov_diff: float
+    oreb_diff: float
+    ftr_diff: float
+    def_efg_diff: float
+    def_tov_diff: float
+    def_oreb_diff: float
+    def_ftr_diff: float
+    home_composite: float
+    away_composite: float
+    composite: float
+
 
 def calculate_efg(fgm: int, fg3m: int, fga: int) -> float:
     """
@@ -134,30 +164,18 @@ def calculate_four_factors_composite(
     Returns:
         Composite score (positive = better)
     """
-    # Weights from Dean Oliver's research
-    efg_weight = settings.efg_weight  # 0.40
-    tov_weight = settings.tov_weight  # 0.25
-    oreb_weight = settings.oreb_weight  # 0.20
-    ftr_weight = settings.ftr_weight  # 0.15
-
-    # Offensive factors (higher is better, except TOV)
-    off_score = (
-        efg_weight * efg
-        - tov_weight * tov  # Lower TOV is better
-        + oreb_weight * oreb
-        + ftr_weight * ftr
-    )
-
-    # Defensive factors (inverse - lower opponent values are better)
-    def_score = (
-        efg_weight * (1 - opp_efg)  # Lower opponent eFG is better
-        + tov_weight * opp_tov  # Higher opponent TOV is better (we force turnovers)
-        + oreb_weight * (1 - opp_oreb)  # Lower opponent OREB is better
-        + ftr_weight * (1 - opp_ftr)  # Lower opponent FTR is better
+    # Offensive factors (higher is better, except TOV) plus defensive
+    # factors (lower opponent eFG/OREB/FTR and higher opponent TOV are better),
+    # folded so each weight is applied once:
+    #   w * x + w * (1 - opp_x) = w + w * (x - opp_x)
+    return (
+        _DEF_BASELINE
+        + _EFG_WEIGHT * (efg - opp_efg)
+        + _TOV_WEIGHT * (opp_tov - tov)
+        + _OREB_WEIGHT * (oreb - opp_oreb)
+        + _FTR_WEIGHT * (ftr - opp_ftr)
     )
 
-    return off_score + def_score
-
 
 def calculate_four_factors_differential(
     home_efg: float,
@@ -176,7 +194,7 @@ def calculate_four_factors_differential(
     away_opp_tov: float,
     away_opp_oreb: float,
     away_opp_ftr: float,
-) -> dict:
+) -> FourFactorsDifferential:
     """
     Calculate Four Factors differentials between home and away teams.
 
@@ -188,7 +206,7 @@ def calculate_four_factors_differential(
         away_*: Away team's Four Factors
 
     Returns:
-        Dictionary with differentials for each factor and composite
+        FourFactorsDifferential with each factor differential and composite
     """
     # Offensive differentials (home - away)
     efg_diff = home_efg - away_efg
@@ -213,19 +231,74 @@ def calculate_four_factors_differential(
         away_opp_efg, away_opp_tov, away_opp_oreb, away_opp_ftr,
     )
 
-    return {
+    return FourFactorsDifferential(
         # Offensive factor differentials
-        "efg_diff": round(efg_diff, 4),
-        "tov_diff": round(tov_diff, 4),
-        "oreb_diff": round(oreb_diff, 4),
-        "ftr_diff": round(ftr_diff, 4),
+        efg_diff,
+        tov_diff,
+        oreb_diff,
+        ftr_diff,
         # Defensive factor differentials
-        "def_efg_diff": round(def_efg_diff, 4),
-        "def_tov_diff": round(def_tov_diff, 4),
-        "def_oreb_diff": round(def_oreb_diff, 4),
-        "def_ftr_diff": round(def_ftr_diff, 4),
+        def_efg_diff,
+        def_tov_diff,
+        def_oreb_diff,
+        def_ftr_diff,
         # Composite scores
-        "home_composite": round(home_composite, 4),
-        "away_composite": round(away_composite, 4),
-        "composite": round(home_composite - away_composite, 4),
+        home_composite,
+        away_composite,
+        home_composite - away_composite,
+    )
+
+
+def calculate_four_factors_differential_vec(
+    home_efg: np.ndarray,
+    home_tov: np.ndarray,
+    home_oreb: np.ndarray,
+    home_ftr: np.ndarray,
+    home_opp_efg: np.ndarray,
+    home_opp_tov: np.ndarray,
+    home_opp_oreb: np.ndarray,
+    home_opp_ftr: np.ndarray,
+    away_efg: np.ndarray,
+    away_tov: np.ndarray,
+    away_oreb: np.ndarray,
+    away_ftr: np.ndarray,
+    away_opp_efg: np.ndarray,
+    away_opp_tov: np.ndarray,
+    away_opp_oreb: np.ndarray,
+    away_opp_ftr: np.ndarray,
+) -> dict[str, np.ndarray]:
+    """
+    Vectorized Four Factors differentials for a batch of games.
+
+    Same formulas as calculate_four_factors_differential, but every
+    argument is a 1-D array with one entry per game.
+
+    Args:
+        home_*: Home teams' Four Factors
+        away_*: Away teams' Four Factors
+
+    Returns:
+        Dictionary of arrays keyed like the FourFactorsDifferential fields
+    """
+    home_composite = calculate_four_factors_composite(
+        home_efg, home_tov, home_oreb, home_ftr,
+        home_opp_efg, home_opp_tov, home_opp_oreb, home_opp_ftr,
+    )
+    away_composite = calculate_four_factors_composite(
+        away_efg, away_tov, away_oreb, away_ftr,
+        away_opp_efg, away_opp_tov, away_opp_oreb, away_opp_ftr,
+    )
+
+    return {
+        "efg_diff": home_efg - away_efg,
+        "tov_diff": away_tov - home_tov,
+        "oreb_diff": home_oreb - away_oreb,
+        "ftr_diff": home_ftr - away_ftr,
+        "def_efg_diff": away_opp_efg - home_opp_efg,
+        "def_tov_diff": home_opp_tov - away_opp_tov,
+        "def_oreb_diff": away_opp_oreb - home_opp_oreb,
+        "def_ftr_diff": away_opp_ftr - home_opp_ftr,
+        "home_composite": home_composite,
+        "away_composite": away_composite,
+        "composite": home_composite - away_composite,
     }
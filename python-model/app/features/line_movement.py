@@ -9,7 +9,31 @@ Key metrics:
 - Total movement: Change from opening to closing total
 - Reverse line movement: When line moves against public betting %
 """
-from typing import Optional
+from decimal import Decimal
+from typing import Iterable, NamedTuple, Optional, Union
+
+import numpy as np
+
+# spread_direction labels, indexed by the integer codes of the vectorized path
+SPREAD_DIRECTIONS = ("sharp_home", "sharp_away", "stable")
+
+
+class LineMovementFeatures(NamedTuple):
+    """Line movement features for a game."""
+
+    opening_spread: float
+    current_spread: float
+    spread_movement: float
+    spread_direction: str
+    opening_total: float
+    current_total: float
+    total_movement: float
+    implied_prob_shift: float
+
+
+def _sub_or_zero(current: Optional[float], opening: Optional[float]) -> float:
+    """Return current - opening, or 0.0 if either line is missing."""
+    return current - opening if current is not None and opening is not None else 0.0
 
 
 def calculate_spread_movement(
@@ -29,10 +53,7 @@ def calculate_spread_movement(
     Returns:
         Spread movement (closing - opening)
     """
-    if opening_spread is None or closing_spread is None:
-        return 0.0
-
-    return closing_spread - opening_spread
+    return _sub_or_zero(closing_spread, opening_spread)
 
 
 def calculate_total_movement(
@@ -52,10 +73,7 @@ def calculate_total_movement(
     Returns:
         Total movement (closing - opening)
     """
-    if opening_total is None or closing_total is None:
-        return 0.0
-
-    return closing_total - opening_total
+    return _sub_or_zero(closing_total, opening_total)
 
 
 def classify_line_movement(movement: float, threshold: float = 1.0) -> str:
@@ -93,11 +111,14 @@ def calculate_implied_probability_shift(
     Returns:
         Implied probability shift (positive = home more likely to win)
     """
-    movement = calculate_spread_movement(opening_spread, closing_spread)
+    return _implied_shift(_sub_or_zero(closing_spread, opening_spread))
 
+
+def _implied_shift(spread_movement: float) -> float:
+    """Implied probability shift for an already-computed spread movement."""
     # 1 point = ~3% probability
     # Negative movement (line moving toward home) = home more favored
-    return -movement * 0.03
+    return -spread_movement * 0.03
 
 
 def calculate_line_movement_features(
@@ -105,7 +126,7 @@ def calculate_line_movement_features(
     current_spread: Optional[float],
     opening_total: Optional[float] = None,
     current_total: Optional[float] = None,
-) -> dict:
+) -> LineMovementFeatures:
     """
     Calculate all line movement features for prediction.
 
@@ -116,22 +137,106 @@ def calculate_line_movement_features(
         current_total: Current/closing total
 
     Returns:
-        Dictionary with line movement features
+        LineMovementFeatures for the game
+    """
+    # Compute the movement once and share it with the direction and shift
+    spread_movement = _sub_or_zero(current_spread, opening_spread)
+    total_movement = _sub_or_zero(current_total, opening_total)
+
+    return LineMovementFeatures(
+        opening_spread if opening_spread is not None else 0.0,
+        current_spread if current_spread is not None else 0.0,
+        spread_movement,
+        classify_line_movement(spread_movement),
+        opening_total if opening_total is not None else 0.0,
+        current_total if current_total is not None else 0.0,
+        total_movement,
+        _implied_shift(spread_movement),
+    )
+
+
+def lines_to_array(
+    values: Iterable[Union[float, Decimal, None]], dtype: np.dtype = np.float32
+) -> np.ndarray:
+    """
+    Convert optional line values from the API boundary into a float array.
+
+    Args:
+        values: Spreads/totals as floats or Decimals, None where missing
+        dtype: Floating dtype of the result (float32 halves memory for large batches)
+
+    Returns:
+        1-D array with NaN for missing values, ready for the *_vec functions
+    """
+    return np.array([np.nan if v is None else float(v) for v in values], dtype=dtype)
+
+
+def _as_line_array(values) -> np.ndarray:
+    """View values as a floating array, keeping float32 input as float32."""
+    arr = np.asarray(values)
+    return arr if arr.dtype.kind == "f" else arr.astype(np.float64)
+
+
+def classify_line_movement_vec(movement: np.ndarray, threshold: float = 1.0) -> np.ndarray:
+    """
+    Vectorized classify_line_movement returning integer codes.
+
+    Args:
+        movement: Line movement per game
+        threshold: Significant movement threshold (default 1 point)
+
+    Returns:
+        int8 codes indexing SPREAD_DIRECTIONS (0 = sharp_home, 1 = sharp_away, 2 = stable)
+    """
+    return np.select(
+        [movement <= -threshold, movement >= threshold], [0, 1], default=2
+    ).astype(np.int8)
+
+
+def calculate_line_movement_features_vec(
+    opening_spread: np.ndarray,
+    current_spread: np.ndarray,
+    opening_total: Optional[np.ndarray] = None,
+    current_total: Optional[np.ndarray] = None,
+) -> dict[str, np.ndarray]:
+    """
+    Vectorized line movement features for a batch of games.
+
+    Same formulas as calculate_line_movement_features, but every argument
+    is a 1-D array with one entry per game and missing lines are NaN.
+    Floating input keeps its dtype, so float32 batches stay float32.
+    spread_direction is returned as integer codes; map them through
+    SPREAD_DIRECTIONS only when serializing.
+
+    Args:
+        opening_spread: Opening spreads
+        current_spread: Current/closing spreads
+        opening_total: Opening totals (None = not tracked)
+        current_total: Current/closing totals (None = not tracked)
+
+    Returns:
+        Dictionary of arrays keyed like the LineMovementFeatures fields
     """
-    spread_movement = calculate_spread_movement(opening_spread, current_spread)
-    total_movement = calculate_total_movement(opening_total, current_total)
+    opening_spread = _as_line_array(opening_spread)
+    current_spread = _as_line_array(current_spread)
+    if opening_total is None or current_total is None:
+        opening_total = current_total = np.full(opening_spread.shape, np.nan, opening_spread.dtype)
+    opening_total = _as_line_array(opening_total)
+    current_total = _as_line_array(current_total)
+
+    # A missing side yields NaN, which counts as no movement
+    spread_movement = np.nan_to_num(current_spread - opening_spread)
+    total_movement = np.nan_to_num(current_total - opening_total)
 
     return {
-        "opening_spread": opening_spread if opening_spread is not None else 0.0,
-        "current_spread": current_spread if current_spread is not None else 0.0,
-        "spread_movement": round(spread_movement, 2),
-        "spread_direction": classify_line_movement(spread_movement),
-        "opening_total": opening_total if opening_total is not None else 0.0,
-        "current_total": current_total if current_total is not None else 0.0,
-        "total_movement": round(total_movement, 2),
-        "implied_prob_shift": round(
-            calculate_implied_probability_shift(opening_spread, current_spread), 4
-        ),
+        "opening_spread": np.nan_to_num(opening_spread),
+        "current_spread": np.nan_to_num(current_spread),
+        "spread_movement": spread_movement,
+        "spread_direction": classify_line_movement_vec(spread_movement),
+        "opening_total": np.nan_to_num(opening_total),
+        "current_total": np.nan_to_num(current_total),
+        "total_movement": total_movement,
+        "implied_prob_shift": -spread_movement * 0.03,
     }
 
 
@@ -189,18 +294,40 @@ def steam_move_detected(
     if len(movements) < 2:
         return False
 
-    # Sort by timestamp
-    sorted_movements = sorted(movements, key=lambda x: x.get("timestamp", 0))
+    timestamps, spreads = movements_to_arrays(movements)
+    return _steam_move_detected(timestamps, spreads, threshold_points, threshold_minutes * 60)
 
-    # Look for rapid movements
-    for i in range(1, len(sorted_movements)):
-        prev = sorted_movements[i - 1]
-        curr = sorted_movements[i]
 
-        time_diff = (curr.get("timestamp", 0) - prev.get("timestamp", 0)) / 60  # minutes
-        spread_diff = abs(curr.get("spread", 0) - prev.get("spread", 0))
+def movements_to_arrays(movements: list[dict]) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Convert line movement records to parallel arrays sorted by timestamp.
 
-        if time_diff <= threshold_minutes and spread_diff >= threshold_points:
-            return True
+    Args:
+        movements: List of line movement records with 'spread', 'timestamp'
+            (missing values count as 0)
 
-    return False
+    Returns:
+        Tuple of (timestamps in seconds, spreads)
+    """
+    timestamps = np.fromiter(
+        (m.get("timestamp", 0) for m in movements), dtype=np.float64, count=len(movements)
+    )
+    spreads = np.fromiter(
+        (m.get("spread", 0) for m in movements), dtype=np.float64, count=len(movements)
+    )
+
+    order = np.argsort(timestamps, kind="stable")
+    return timestamps[order], spreads[order]
+
+
+def _steam_move_detected(
+    timestamps: np.ndarray,
+    spreads: np.ndarray,
+    threshold_points: float,
+    threshold_seconds: float,
+) -> bool:
+    """Check sorted tick arrays for any consecutive pair that moved fast enough."""
+    rapid = (np.diff(timestamps) <= threshold_seconds) & (
+        np.abs(np.diff(spreads)) >= threshold_points
+    )
+    return bool(rapid.any())
@@ -10,6 +10,19 @@ Possessions = FGA - OREB + TOV + 0.44 * FTA
 Game pace projection uses the average of both teams' pace,
 adjusted for the expected defensive impact.
 """
+from typing import NamedTuple
+
+import numpy as np
+
+
+class PaceMetrics(NamedTuple):
+    """Pace metrics for a matchup."""
+
+    home_pace: float
+    away_pace: float
+    pace_diff: float
+    projected_pace: float
+    pace_vs_league: float
 
 
 def calculate_possessions(fga: int, oreb: int, tov: int, fta: int) -> float:
@@ -67,6 +80,46 @@ def calculate_points_per_100(points: int, possessions: float) -> float:
     return (points / possessions) * 100
 
 
+def calculate_pace_ratings_vec(
+    fga: np.ndarray,
+    oreb: np.ndarray,
+    tov: np.ndarray,
+    fta: np.ndarray,
+    points: np.ndarray,
+    minutes: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Vectorized possessions, pace and points per 100 for many team-games.
+
+    Fuses calculate_possessions, calculate_pace and calculate_points_per_100
+    into one pass over the box-score arrays (same zero-division rules).
+
+    Args:
+        fga: Field goal attempts
+        oreb: Offensive rebounds
+        tov: Turnovers
+        fta: Free throw attempts
+        points: Points scored
+        minutes: Game durations
+
+    Returns:
+        Tuple of (possessions, pace, points per 100) arrays
+    """
+    possessions = np.asarray(fga - oreb + tov + 0.44 * fta, dtype=np.float64)
+    minutes = np.asarray(minutes, dtype=np.float64)
+
+    pace = np.divide(
+        possessions * 48.0, minutes, out=np.zeros_like(possessions), where=minutes != 0
+    )
+    points_per_100 = np.divide(
+        np.asarray(points, dtype=np.float64) * 100,
+        possessions,
+        out=np.zeros_like(possessions),
+        where=possessions != 0,
+    )
+    return possessions, pace, points_per_100
+
+
 def project_game_pace(home_pace: float, away_pace: float, league_avg_pace: float = 100.0) -> float:
     """
     Project the expected pace for a game.
@@ -82,14 +135,20 @@ def project_game_pace(home_pace: float, away_pace: float, league_avg_pace: float
     Returns:
         Projected game pace
     """
-    # Simple average of both teams
-    team_avg = (home_pace + away_pace) / 2
+    # Average of both teams, regressed 10% toward league average (0.5 * 0.9 = 0.45)
+    return home_pace * 0.45 + away_pace * 0.45 + league_avg_pace * 0.10
 
-    # Regress 10% toward league average
-    regression_factor = 0.10
-    projected = team_avg * (1 - regression_factor) + league_avg_pace * regression_factor
 
-    return round(projected, 1)
+def project_game_pace_vec(
+    home_pace: np.ndarray, away_pace: np.ndarray, league_avg_pace: float | np.ndarray = 100.0
+) -> np.ndarray:
+    """
+    Vectorized project_game_pace for many games (same weights, elementwise).
+
+    Returns:
+        Projected game pace per game
+    """
+    return np.asarray(home_pace) * 0.45 + np.asarray(away_pace) * 0.45 + league_avg_pace * 0.10
 
 
 def project_game_total(
@@ -115,24 +174,35 @@ def project_game_total(
     Returns:
         Projected total points
     """
-    # Home team's expected points = f(home offense, away defense)
-    # Average the offensive rating against the defensive rating
-    home_expected_ortg = (home_ortg + away_drtg) / 2
-    away_expected_ortg = (away_ortg + home_drtg) / 2
-
-    # Convert to actual points using pace
-    # Points = (ORTG / 100) * possessions
-    # Since pace is possessions per 48 min, and NBA games are 48 min
-    home_points = (home_expected_ortg / 100) * projected_pace
-    away_points = (away_expected_ortg / 100) * projected_pace
+    # Each side's expected rating is the average of its offense and the
+    # opponent's defense; points = rating / 100 * pace. Both sides share the
+    # pace factor, so /2 and /100 fold into one multiply by 0.005.
+    # Plus a small home court scoring advantage (~1.5 points).
+    return (home_ortg + away_drtg + away_ortg + home_drtg) * projected_pace * 0.005 + 1.5
+
+
+def project_game_total_vec(
+    home_ortg: np.ndarray,
+    home_drtg: np.ndarray,
+    away_ortg: np.ndarray,
+    away_drtg: np.ndarray,
+    projected_pace: np.ndarray,
+) -> np.ndarray:
+    """
+    Vectorized project_game_total for many games or simulated paces.
 
-    # Add small home court scoring advantage (~1.5 points)
-    home_points += 1.5
+    Arguments broadcast against each other, so a single matchup can be
+    scored over an array of sampled paces in one expression.
 
-    return round(home_points + away_points, 1)
+    Returns:
+        Projected total points (unrounded)
+    """
+    return (home_ortg + away_drtg + away_ortg + home_drtg) * np.asarray(projected_pace) * 0.005 + 1.5
 
 
-def calculate_pace_metrics(home_pace: float, away_pace: float, league_avg_pace: float = 100.0) -> dict:
+def calculate_pace_metrics(
+    home_pace: float, away_pace: float, league_avg_pace: float = 100.0
+) -> PaceMetrics:
     """
     Calculate all pace-related metrics for a matchup.
 
@@ -142,7 +212,7 @@ def calculate_pace_metrics(home_pace: float, away_pace: float, league_avg_pace:
         league_avg_pace: League average pace
 
     Returns:
-        Dictionary with pace metrics
+        PaceMetrics for the matchup
     """
     pace_diff = home_pace - away_pace
     projected = project_game_pace(home_pace, away_pace, league_avg_pace)
@@ -150,13 +220,13 @@ def calculate_pace_metrics(home_pace: float, away_pace: float, league_avg_pace:
     # Pace differential from league average (positive = fast game expected)
     pace_vs_league = projected - league_avg_pace
 
-    return {
-        "home_pace": round(home_pace, 1),
-        "away_pace": round(away_pace, 1),
-        "pace_diff": round(pace_diff, 1),
-        "projected_pace": projected,
-        "pace_vs_league": round(pace_vs_league, 1),
-    }
+    return PaceMetrics(
+        home_pace,
+        away_pace,
+        pace_diff,
+        projected,
+        pace_vs_league,
+    )
 
 
 def pace_adjustment_factor(game_pace: float, league_avg_pace: float = 100.0) -> float:
@@ -180,4 +250,4 @@ def pace_adjustment_factor(game_pace: float, league_avg_pace: float = 100.0) ->
     # Max adjustment of 10% either way
     adjustment = 1.0 - (pace_deviation * 0.5)
 
-    return max(0.9, min(1.1, adjustment))
+    return 0.9 if adjustment < 0.9 else (1.1 if adjustment > 1.1 else adjustment)
@@ -12,35 +12,78 @@ Components:
 - BPM = OBPM + DBPM
 - VORP: Value Over Replacement Player (BPM scaled by minutes)
 """
-from typing import Optional
+from typing import NamedTuple, Optional
 
+import numpy as np
 
-def calculate_team_bpm(player_bpms: list[dict]) -> float:
+
+class BpmDifferential(NamedTuple):
+    """BPM differentials for a matchup."""
+
+    home_bpm: float
+    away_bpm: float
+    bpm_diff: float
+    home_top_5_bpm: Optional[float]
+    away_top_5_bpm: Optional[float]
+    top_5_bpm_diff: float
+
+
+class PlayerBPMSoA(NamedTuple):
+    """A roster as parallel arrays (one entry per player)."""
+
+    bpm: np.ndarray
+    minutes: np.ndarray
+    player_id: np.ndarray
+
+
+def roster_to_soa(player_bpms: list[dict]) -> PlayerBPMSoA:
+    """
+    Convert a roster of player dicts to parallel arrays (missing values count as 0).
+
+    Build this once per roster and pass it to the BPM functions below to
+    skip the per-player dict lookups on every call.
+
+    Args:
+        player_bpms: List of dicts with 'bpm', 'minutes' and 'player_id' keys
+
+    Returns:
+        PlayerBPMSoA for the roster
+    """
+    count = len(player_bpms)
+    bpm = np.fromiter((p.get("bpm", 0) for p in player_bpms), dtype=np.float64, count=count)
+    minutes = np.fromiter(
+        (p.get("minutes", 0) for p in player_bpms), dtype=np.float64, count=count
+    )
+    player_id = np.array([p.get("player_id") for p in player_bpms])
+    return PlayerBPMSoA(bpm, minutes, player_id)
+
+
+def _as_soa(player_bpms: list[dict] | PlayerBPMSoA) -> PlayerBPMSoA:
+    """Accept either roster form."""
+    if isinstance(player_bpms, PlayerBPMSoA):
+        return player_bpms
+    return roster_to_soa(player_bpms)
+
+
+def calculate_team_bpm(player_bpms: list[dict] | PlayerBPMSoA) -> float:
     """
     Calculate team-aggregate BPM weighted by minutes played.
 
     Args:
-        player_bpms: List of dicts with 'bpm' and 'minutes' keys
+        player_bpms: List of dicts with 'bpm' and 'minutes' keys, or a PlayerBPMSoA
 
     Returns:
         Weighted team BPM
     """
-    if not player_bpms:
-        return 0.0
-
-    total_minutes = sum(p.get("minutes", 0) for p in player_bpms)
+    soa = _as_soa(player_bpms)
+    total_minutes = soa.minutes.sum()
     if total_minutes == 0:
         return 0.0
 
-    weighted_bpm = sum(
-        p.get("bpm", 0) * p.get("minutes", 0)
-        for p in player_bpms
-    )
-
-    return weighted_bpm / total_minutes
+    return float(np.dot(soa.bpm, soa.minutes) / total_minutes)
 
 
-def calculate_top_n_bpm(player_bpms: list[dict], n: int = 5) -> float:
+def calculate_top_n_bpm(player_bpms: list[dict] | PlayerBPMSoA, n: int = 5) -> float:
     """
     Calculate average BPM of top N players by BPM.
 
@@ -48,27 +91,25 @@ def calculate_top_n_bpm(player_bpms: list[dict], n: int = 5) -> float:
     more predictive than full team BPM.
 
     Args:
-        player_bpms: List of dicts with 'bpm' key
+        player_bpms: List of dicts with 'bpm' key, or a PlayerBPMSoA
         n: Number of top players to average
 
     Returns:
         Average BPM of top N players
     """
-    if not player_bpms:
-        return 0.0
-
-    sorted_players = sorted(player_bpms, key=lambda p: p.get("bpm", 0), reverse=True)
-    top_n = sorted_players[:n]
-
-    if not top_n:
+    bpm = _as_soa(player_bpms).bpm
+    if bpm.size == 0 or n <= 0:
         return 0.0
+    if n >= bpm.size:
+        return float(bpm.mean())
 
-    return sum(p.get("bpm", 0) for p in top_n) / len(top_n)
+    # O(n) selection of the top n instead of a full sort
+    return float(np.partition(bpm, -n)[-n:].mean())
 
 
 def calculate_injury_adjusted_bpm(
-    player_bpms: list[dict],
-    injured_player_ids: list[int],
+    player_bpms: list[dict] | PlayerBPMSoA,
+    injured_player_ids: list[str],
     replacement_bpm: float = -2.0,
 ) -> float:
     """
@@ -78,33 +119,23 @@ def calculate_injury_adjusted_bpm(
     accounting for the minutes they would have played.
 
     Args:
-        player_bpms: List of player BPM data
-        injured_player_ids: IDs of injured players
+        player_bpms: List of player BPM data, or a PlayerBPMSoA
+        injured_player_ids: Basketball Reference slugs of injured players
         replacement_bpm: BPM of replacement-level player (default -2.0)
 
     Returns:
         Injury-adjusted team BPM
     """
-    if not player_bpms:
-        return 0.0
-
-    total_minutes = 0
-    weighted_bpm = 0
-
-    for player in player_bpms:
-        minutes = player.get("minutes", 0)
-        total_minutes += minutes
-
-        if player.get("player_id") in injured_player_ids:
-            # Use replacement-level BPM for injured players
-            weighted_bpm += replacement_bpm * minutes
-        else:
-            weighted_bpm += player.get("bpm", 0) * minutes
-
+    soa = _as_soa(player_bpms)
+    total_minutes = soa.minutes.sum()
     if total_minutes == 0:
         return 0.0
 
-    return weighted_bpm / total_minutes
+    # Use replacement-level BPM for injured players (branch-free masked dot product)
+    injured = np.isin(soa.player_id, injured_player_ids)
+    adjusted = np.where(injured, replacement_bpm, soa.bpm)
+
+    return float(np.dot(adjusted, soa.minutes) / total_minutes)
 
 
 def calculate_bpm_differential(
@@ -112,7 +143,7 @@ def calculate_bpm_differential(
     away_bpm: Optional[float],
     home_top_5_bpm: Optional[float] = None,
     away_top_5_bpm: Optional[float] = None,
-) -> dict:
+) -> BpmDifferential:
     """
     Calculate BPM differentials for a matchup.
 
@@ -123,7 +154,7 @@ def calculate_bpm_differential(
         away_top_5_bpm: Away team top 5 players BPM
 
     Returns:
-        Dictionary with BPM differentials
+        BpmDifferential for the matchup
     """
     # Handle missing data
     h_bpm = home_bpm if home_bpm is not None else 0.0
@@ -137,14 +168,14 @@ def calculate_bpm_differential(
     else:
         top_5_diff = 0.0
 
-    return {
-        "home_bpm": round(h_bpm, 2),
-        "away_bpm": round(a_bpm, 2),
-        "bpm_diff": round(bpm_diff, 2),
-        "home_top_5_bpm": round(home_top_5_bpm, 2) if home_top_5_bpm else None,
-        "away_top_5_bpm": round(away_top_5_bpm, 2) if away_top_5_bpm else None,
-        "top_5_bpm_diff": round(top_5_diff, 2),
-    }
+    return BpmDifferential(
+        h_bpm,
+        a_bpm,
+        bpm_diff,
+        home_top_5_bpm if home_top_5_bpm else None,
+        away_top_5_bpm if away_top_5_bpm else None,
+        top_5_diff,
+    )
 
 
 def estimate_win_impact(bpm_diff: float) -> float:
@@ -1,37 +1,80 @@
 """
 FastAPI entry point for the XGBoost NBA Prediction microservice.
 """
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from contextlib import asynccontextmanager
 
 from app.config import get_settings
 from app.api.routes import health, predictions, features
 from app.models.model_loader import load_model
+from app.models.xgboost_model import FEATURE_ORDER
+from app.serving.batcher import BatchPredictor
 
 settings = get_settings()
 
+logging.basicConfig(
+    level=logging.DEBUG if settings.debug else logging.INFO,
+    format="%(levelname)s:     %(name)s - %(message)s",
+)
+logger = logging.getLogger(__name__)
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Lifecycle manager for startup/shutdown events."""
     # Startup: Load the XGBoost model
-    print(f"Loading XGBoost model from {settings.model_path}...")
+    logger.info("Loading XGBoost model from %s", settings.model_path)
     try:
-        app.state.model = load_model(settings.model_path)
-        print("Model loaded successfully!")
+        app.state.model = load_model(settings.model_path, device=settings.inference_device)
+        logger.info("Model loaded successfully")
     except FileNotFoundError:
-        print(f"Warning: Model file not found at {settings.model_path}")
-        print("Service will start but predictions will fail until model is trained.")
+        logger.warning(
+            "Model file not found at %s; service will start but predictions "
+            "will fail until model is trained",
+            settings.model_path,
+        )
         app.state.model = None
     except Exception as e:
-        print(f"Warning: Failed to load model: {e}")
+        logger.warning("Failed to load model: %s", e)
         app.state.model = None
 
+    # Warm the prediction path so the first request doesn't pay cold-cache costs
+    if app.state.model is not None:
+        try:
+            app.state.model.predict_probs(np.zeros((1, len(FEATURE_ORDER))))
+        except Exception as e:
+            logger.warning("Model warmup failed: %s", e)
+
+    # Bounded pool for model calls (the booster itself runs single-threaded)
+    app.state.infer_pool = ThreadPoolExecutor(
+        max_workers=settings.inference_threads,
+        thread_name_prefix="xgb-infer",
+    )
+
+    # Coalesce concurrent single-game predictions into batched model calls
+    app.state.batcher = None
+    if app.state.model is not None:
+        app.state.batcher = BatchPredictor(
+            app.state.model,
+            max_batch=settings.batch_max_size,
+            max_delay=settings.batch_max_delay_ms / 1000,
+            executor=app.state.infer_pool,
+        )
+        app.state.batcher.start()
+
     yield
 
     # Shutdown: Cleanup if needed
-    print("Shutting down XGBoost service...")
+    if app.state.batcher is not None:
+        await app.state.batcher.stop()
+    app.state.infer_pool.shutdown(wait=False, cancel_futures=True)
+    logger.info("Shutting down XGBoost service")
 
 
 app = FastAPI(
@@ -39,6 +82,8 @@ app = FastAPI(
     version=settings.app_version,
     description="XGBoost-based NBA game prediction microservice",
     lifespan=lifespan,
+    # orjson serializes the float-heavy prediction/feature payloads much faster than stdlib json
+    default_response_class=ORJSONResponse,
 )
 
 # CORS middleware
@@ -74,4 +119,8 @@ if __name__ == "__main__":
         host=settings.host,
         port=settings.port,
         reload=settings.debug,
+        workers=1 if settings.debug else settings.uvicorn_workers,
+        loop=settings.uvicorn_loop,
+        http=settings.uvicorn_http,
+        log_level="debug" if settings.debug else "info",
     )
@@ -2,22 +2,50 @@
 Model loading utilities.
 """
 import os
+import copy
 import json
+import logging
+from functools import lru_cache
 from typing import Optional
 
 import xgboost as xgb
 
 from app.models.xgboost_model import XGBoostNBAModel, FallbackModel, FEATURE_ORDER
 
+logger = logging.getLogger(__name__)
 
-def load_model(model_path: str) -> XGBoostNBAModel:
+
+def _metadata_path(model_path: str) -> str:
+    """Path of the metadata sidecar saved next to a model file (any extension)."""
+    return os.path.splitext(model_path)[0] + "_metadata.json"
+
+
+def _read_metadata(model_path: str) -> Optional[dict]:
+    """Parse the metadata sidecar for a model, or None if there isn't one."""
+    try:
+        with open(_metadata_path(model_path), "r") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def _metadata_mtime_ns(model_path: str) -> Optional[int]:
+    """mtime of a model's metadata sidecar, or None if there isn't one."""
+    try:
+        return os.stat(_metadata_path(model_path)).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+def load_model(model_path: str, device: str = "cpu") -> XGBoostNBAModel:
     """
     Load a trained XGBoost model from file.
 
-    Supports both JSON and binary formats.
+    Supports JSON, UBJSON (.ubj, the default) and binary formats.
 
     Args:
         model_path: Path to the model file
+        device: XGBoost device to predict on ("cpu", "cuda", ...)
 
     Returns:
         XGBoostNBAModel wrapper
@@ -25,30 +53,51 @@ def load_model(model_path: str) -> XGBoostNBAModel:
     Raises:
         FileNotFoundError: If model file doesn't exist
     """
-    if not os.path.exists(model_path):
-        raise FileNotFoundError(f"Model not found at {model_path}")
+    # One stat both checks existence and keys the cache by mtime, so a
+    # retrained model on the same path is reloaded
+    try:
+        mtime_ns = os.stat(model_path).st_mtime_ns
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Model not found at {model_path}") from None
+
+    # save_model writes the sidecar after the model, so key on its mtime too;
+    # a load that lands between the two writes is redone once the sidecar lands
+    return _load_model_cached(
+        os.path.abspath(model_path), mtime_ns, _metadata_mtime_ns(model_path), device
+    )
+
 
+@lru_cache(maxsize=8)
+def _load_model_cached(
+    model_path: str, mtime_ns: int, metadata_mtime_ns: Optional[int], device: str
+) -> XGBoostNBAModel:
+    """Load and wrap the model at model_path (cached per path, model and sidecar mtime, and device)."""
     # Create booster and load model
     booster = xgb.Booster()
 
-    if model_path.endswith(".json"):
-        booster.load_model(model_path)
-    elif model_path.endswith(".bin") or model_path.endswith(".ubj"):
-        booster.load_model(model_path)
-    else:
-        # Try JSON format by default
+    # XGBoost detects JSON vs binary/UBJSON from the file itself
+    try:
         booster.load_model(model_path)
+    except xgb.core.XGBoostError as e:
+        if not os.path.exists(model_path):
+            # Removed between the stat in load_model and here
+            raise FileNotFoundError(f"Model not found at {model_path}") from e
+        raise
 
-    # Try to load feature names from accompanying metadata file
-    feature_names = FEATURE_ORDER
-    metadata_path = model_path.replace(".json", "_metadata.json").replace(".bin", "_metadata.json")
+    # Requests are already parallel across uvicorn workers and the inference
+    # pool; a single OpenMP thread per call avoids oversubscribing the CPU
+    booster.set_param({"nthread": 1})
 
-    if os.path.exists(metadata_path):
-        with open(metadata_path, "r") as f:
-            metadata = json.load(f)
-            feature_names = metadata.get("feature_names", FEATURE_ORDER)
+    if device != "cpu":
+        try:
+            booster.set_param({"device": device})
+        except xgb.core.XGBoostError as e:
+            logger.warning("Device %s unavailable (%s), predicting on CPU", device, e)
 
-    return XGBoostNBAModel(booster, feature_names)
+    # Parse the accompanying metadata file once and keep it on the wrapper
+    metadata = _read_metadata(model_path) or {}
+
+    return XGBoostNBAModel(booster, metadata.get("feature_names", FEATURE_ORDER), metadata)
 
 
 def load_model_or_fallback(model_path: str) -> XGBoostNBAModel | FallbackModel:
@@ -64,10 +113,10 @@ def load_model_or_fallback(model_path: str) -> XGBoostNBAModel | FallbackModel:
     try:
         return load_model(model_path)
     except FileNotFoundError:
-        print(f"Model not found at {model_path}, using fallback model")
+        logger.warning("Model not found at %s, using fallback model", model_path)
         return FallbackModel()
     except Exception as e:
-        print(f"Error loading model: {e}, using fallback model")
+        logger.warning("Error loading model: %s, using fallback model", e)
         return FallbackModel()
 
 
@@ -93,9 +142,9 @@ def save_model(
     model.save_model(model_path)
 
     # Save metadata
-    metadata_path = model_path.replace(".json", "_metadata.json").replace(".bin", "_metadata.json")
+    metadata_path = _metadata_path(model_path)
     meta = metadata or {}
-    meta["feature_names"] = feature_names or FEATURE_ORDER
+    meta["feature_names"] = list(feature_names or FEATURE_ORDER)
 
     with open(metadata_path, "w") as f:
         json.dump(meta, f, indent=2)
@@ -111,19 +160,28 @@ def get_model_info(model_path: str) -> Optional[dict]:
     Returns:
         Dictionary with model info or None if not found
     """
-    if not os.path.exists(model_path):
+    try:
+        stat = os.stat(model_path)
+    except FileNotFoundError:
         return None
 
-    metadata_path = model_path.replace(".json", "_metadata.json").replace(".bin", "_metadata.json")
-
     info = {
         "path": model_path,
-        "size_bytes": os.path.getsize(model_path),
-        "modified": os.path.getmtime(model_path),
+        "size_bytes": stat.st_size,
+        "modified": stat.st_mtime,
     }
 
-    if os.path.exists(metadata_path):
-        with open(metadata_path, "r") as f:
-            info["metadata"] = json.load(f)
+    metadata = _read_model_info_metadata(
+        os.path.abspath(model_path), _metadata_mtime_ns(model_path)
+    )
+    if metadata is not None:
+        # Copy so callers can't mutate the cached dict
+        info["metadata"] = copy.deepcopy(metadata)
 
     return info
+
+
+@lru_cache(maxsize=8)
+def _read_model_info_metadata(model_path: str, metadata_mtime_ns: Optional[int]) -> Optional[dict]:
+    """Metadata for get_model_info (cached per path and sidecar mtime)."""
+    return _read_metadata(model_path)
@@ -1,14 +1,19 @@
 """
 XGBoost model wrapper for NBA game predictions.
 """
+import threading
+from operator import itemgetter
+
 import numpy as np
 import xgboost as xgb
 from typing import Optional
 import math
 
+from app.features.adjusted_rating import WIN_PROB_K, nrtg_to_win_probability_vec
+
 
 # Feature order must match training
-FEATURE_ORDER = [
+FEATURE_ORDER = (
     "adj_nrtg_diff",
     "home_adj_ortg",
     "home_adj_drtg",
@@ -29,45 +34,169 @@ FEATURE_ORDER = [
     "top_5_bpm_diff",
     "spread_movement",
     "opening_spread",
-]
+)
+
+# Column of each feature in a FEATURE_ORDER row
+FEATURE_INDEX = {name: i for i, name in enumerate(FEATURE_ORDER)}
+
+# Scaling from win-probability log-odds to points of spread
+PROB_SPREAD_K = 4.0
+
+# Decimal places for each field of a prediction result
+PREDICTION_PRECISION = {
+    "home_win_prob": 4,
+    "away_win_prob": 4,
+    "predicted_spread": 1,
+    "predicted_total": 1,
+    "predicted_home_score": 1,
+    "predicted_away_score": 1,
+    "confidence": 4,
+}
+
+# Values assumed by the score/spread math when a feature is missing
+SCORE_FEATURE_DEFAULTS = {
+    "adj_nrtg_diff": 0.0,
+    "projected_game_pace": 100.0,
+    "home_adj_ortg": 110.0,
+    "home_adj_drtg": 110.0,
+    "away_adj_ortg": 110.0,
+    "away_adj_drtg": 110.0,
+}
+
+
+def _prob_to_spread_vec(probs: np.ndarray) -> np.ndarray:
+    """
+    Convert win probabilities to predicted spreads.
+
+    Inverse logistic, spread = -PROB_SPREAD_K * ln(p / (1 - p)), with p
+    clipped to [0.01, 0.99] to avoid log(0). With PROB_SPREAD_K = 4,
+    60% ~ -1.6 points, 70% ~ -3.4 and 80% ~ -5.5.
+
+    Args:
+        probs: Win probabilities (0-1)
+
+    Returns:
+        Predicted spreads (negative = favored)
+    """
+    clipped = np.clip(probs, 0.01, 0.99)
+    return -PROB_SPREAD_K * np.log(clipped / (1 - clipped))
+
+
+def _postprocess(
+    probs: np.ndarray,
+    nrtg: np.ndarray,
+    pace: np.ndarray,
+    h_ortg: np.ndarray,
+    h_drtg: np.ndarray,
+    a_ortg: np.ndarray,
+    a_drtg: np.ndarray,
+) -> dict[str, np.ndarray]:
+    """
+    Derive spread, scores, total and confidence for a batch of games.
+
+    Args:
+        probs: Home win probabilities from the model
+        nrtg: Adjusted net rating differentials
+        pace: Projected game paces
+        h_ortg: Home adjusted offensive ratings
+        h_drtg: Home adjusted defensive ratings
+        a_ortg: Away adjusted offensive ratings
+        a_drtg: Away adjusted defensive ratings
+
+    Returns:
+        Dictionary of arrays keyed like the prediction fields, plus has_pace
+        (scores/total only apply where pace > 0). Values are unrounded.
+    """
+    # Blend of NRTG- and probability-based spreads
+    spread = (_prob_to_spread_vec(probs) - nrtg) / 2
+
+    # Points per 100 possessions vs the opponent's defense, +/-1.5 home court, 80-140 range
+    home_score = np.clip((h_ortg + a_drtg) * pace * 0.005 + 1.5, 80, 140)
+    away_score = np.clip((a_ortg + h_drtg) * pace * 0.005 - 1.5, 80, 140)
+    total = home_score + away_score
+
+    # Shift scores so their margin matches the predicted spread
+    spread_adjustment = (-spread - (home_score - away_score)) / 2
+
+    return {
+        "home_win_prob": probs,
+        "away_win_prob": 1 - probs,
+        "predicted_spread": spread,
+        "predicted_total": total,
+        "predicted_home_score": home_score + spread_adjustment,
+        "predicted_away_score": away_score - spread_adjustment,
+        "confidence": np.abs(probs - 0.5) * 2,
+        "has_pace": pace > 0,
+    }
 
 
 class XGBoostNBAModel:
     """Wrapper for XGBoost NBA prediction model."""
 
-    def __init__(self, model: xgb.Booster, feature_names: list[str] = None):
+    def __init__(
+        self,
+        model: xgb.Booster,
+        feature_names: tuple[str, ...] | list[str] = None,
+        metadata: Optional[dict] = None,
+    ):
         """
         Initialize the model wrapper.
 
         Args:
             model: Trained XGBoost Booster
             feature_names: List of feature names in order
+            metadata: Training metadata saved alongside the model
         """
         self.model = model
-        self.feature_names = feature_names or FEATURE_ORDER
-
-    def _prepare_features(self, features: dict) -> xgb.DMatrix:
+        self.feature_names = tuple(feature_names or FEATURE_ORDER)
+        self.metadata = metadata or {}
+
+        # Column permutation from FEATURE_ORDER to the model's own order (None if identical)
+        self._column_order = (
+            None
+            if self.feature_names == FEATURE_ORDER
+            else [FEATURE_INDEX[name] for name in self.feature_names]
+        )
+
+        # Column of each feature in the (possibly reordered) model input
+        self._feature_index = {name: i for i, name in enumerate(self.feature_names)}
+        self._feature_values = itemgetter(*self.feature_names)
+
+        # Stand-ins for missing (NaN) inputs in the score math; 0 where unused
+        self._score_defaults = np.zeros(len(self.feature_names))
+        for name, default in SCORE_FEATURE_DEFAULTS.items():
+            i = self._feature_index.get(name)
+            if i is not None:
+                self._score_defaults[i] = default
+
+        # Reused single-row input for predict_proba. The booster works in
+        # float32 anyway; the lock keeps concurrent inference threads from
+        # overwriting each other's row.
+        self._row_buf = np.zeros((1, len(self.feature_names)), dtype=np.float32)
+        self._row_lock = threading.Lock()
+
+    def _prepare_features(self, features: dict) -> np.ndarray:
         """
-        Convert feature dictionary to DMatrix for prediction.
+        Write a feature dictionary into the shared row buffer.
+
+        Caller must hold self._row_lock until it is done with the buffer.
 
         Args:
             features: Dictionary of feature name -> value
 
         Returns:
-            XGBoost DMatrix
+            The (1, n_features) row buffer
         """
-        # Extract features in correct order
-        feature_values = []
-        for name in self.feature_names:
-            value = features.get(name, 0.0)
-            # Handle None values
-            if value is None:
-                value = 0.0
-            feature_values.append(float(value))
+        # Write known features straight into their columns; missing/None stay 0
+        row = self._row_buf[0]
+        row.fill(0.0)
+        index = self._feature_index
+        for name, value in features.items():
+            i = index.get(name)
+            if i is not None and value is not None:
+                row[i] = value
 
-        # Create numpy array and DMatrix
-        X = np.array([feature_values])
-        return xgb.DMatrix(X, feature_names=self.feature_names)
+        return self._row_buf
 
     def predict_proba(self, features: dict) -> float:
         """
@@ -79,129 +208,176 @@ class XGBoostNBAModel:
         Returns:
             Home team win probability (0-1)
         """
-        dmatrix = self._prepare_features(features)
-        prob = self.model.predict(dmatrix)[0]
+        with self._row_lock:
+            prob = self.model.inplace_predict(self._prepare_features(features))[0]
         return float(prob)
 
-    def predict(self, features: dict) -> dict:
+    def predict(self, features: dict | np.ndarray) -> dict:
         """
         Generate full prediction for a game.
 
         Args:
-            features: Dictionary of features
+            features: Dictionary of features, or a feature row in FEATURE_ORDER
 
         Returns:
             Dictionary with prediction details
         """
-        home_win_prob = self.predict_proba(features)
-        away_win_prob = 1 - home_win_prob
+        if isinstance(features, np.ndarray):
+            return self.predict_from_array(features.reshape(1, -1))[0]
 
-        # Calculate confidence based on probability distance from 0.5
-        confidence = abs(home_win_prob - 0.5) * 2  # Scale to 0-1
+        return self.predict_batch([features])[0]
 
-        # Predict spread from net rating differential
-        # Roughly 1 point of NRTG diff = 1 point spread
-        adj_nrtg_diff = features.get("adj_nrtg_diff", 0)
-        predicted_spread = -adj_nrtg_diff  # Negative = home favored
+    def get_feature_importance(self) -> dict[str, float]:
+        """
+        Get feature importance scores from the model.
 
-        # Adjust spread based on probability
-        # Calibrate: 60% prob ≈ 3 point favorite
-        prob_based_spread = self._prob_to_spread(home_win_prob)
+        Returns:
+            Dictionary mapping feature names to importance scores
+        """
+        importance = self.model.get_score(importance_type="gain")
 
-        # Average the two methods
-        predicted_spread = (predicted_spread + prob_based_spread) / 2
+        # Normalize to sum to 1 in one vectorized pass
+        gains = np.fromiter(importance.values(), dtype=np.float64, count=len(importance))
+        gains /= gains.sum() or 1.0
 
-        # Predict scores and total using pace and ratings
-        projected_pace = features.get("projected_game_pace", 100)
-        home_ortg = features.get("home_adj_ortg", 110)
-        home_drtg = features.get("home_adj_drtg", 110)
-        away_ortg = features.get("away_adj_ortg", 110)
-        away_drtg = features.get("away_adj_drtg", 110)
+        return dict(zip(importance, gains.tolist()))
 
-        predicted_home_score = None
-        predicted_away_score = None
-        predicted_total = None
+    def _prepare_features_batch(self, features_list: list[dict]) -> np.ndarray:
+        """
+        Convert feature dictionaries to one matrix in model column order.
 
-        if projected_pace > 0:
-            # Calculate expected points per 100 possessions for each team
-            # Home team: their offense vs away defense, with home court boost
-            home_efficiency = (home_ortg + away_drtg) / 2
-            # Away team: their offense vs home defense, penalized for road
-            away_efficiency = (away_ortg + home_drtg) / 2
+        Args:
+            features_list: List of feature name -> value dictionaries
 
-            # Apply home court advantage (~3 points)
-            home_court_boost = 1.5  # Points per team
+        Returns:
+            Array of shape (n_games, n_features) with NaN for missing/None values
+        """
+        # Fast path: every dict carries every feature, so rows are gathered
+        # positionally in C and None becomes NaN in the float conversion
+        try:
+            return np.array(
+                [self._feature_values(features) for features in features_list],
+                dtype=np.float64,
+            ).reshape(len(features_list), len(self.feature_names))
+        except KeyError:
+            pass
+
+        X = np.full((len(features_list), len(self.feature_names)), np.nan)
+        index = self._feature_index
+        for row, features in enumerate(features_list):
+            for name, value in features.items():
+                i = index.get(name)
+                if i is not None and value is not None:
+                    X[row, i] = value
+        return X
+
+    def predict_probs(self, X: np.ndarray) -> np.ndarray:
+        """
+        Score a feature matrix with the booster.
 
-            # Calculate scores based on pace (possessions per team per game)
-            possessions = projected_pace  # ~100 possessions per team
-            predicted_home_score = (home_efficiency / 100) * possessions + home_court_boost
-            predicted_away_score = (away_efficiency / 100) * possessions - home_court_boost
+        Single entry point to the inference backend: the booster predicts on
+        whatever device it was loaded for (see model_loader.load_model).
 
-            # Ensure scores are reasonable (80-140 range)
-            predicted_home_score = max(80, min(140, predicted_home_score))
-            predicted_away_score = max(80, min(140, predicted_away_score))
+        Args:
+            X: Feature matrix of shape (n_games, n_features), in model column order
 
-            predicted_total = predicted_home_score + predicted_away_score
+        Returns:
+            Home win probability per game (float64)
+        """
+        # inplace_predict reads the array directly, skipping DMatrix construction
+        return self.model.inplace_predict(X).astype(np.float64)
 
-            # Adjust scores to match predicted spread
-            score_diff = predicted_home_score - predicted_away_score
-            spread_adjustment = (predicted_spread * -1 - score_diff) / 2
-            predicted_home_score += spread_adjustment
-            predicted_away_score -= spread_adjustment
+    def predict_from_array(self, X: np.ndarray) -> list[dict]:
+        """
+        Generate predictions for a batch of games in one model call.
 
-        return {
-            "home_win_prob": round(home_win_prob, 4),
-            "away_win_prob": round(away_win_prob, 4),
-            "predicted_spread": round(predicted_spread, 1),
-            "predicted_total": round(predicted_total, 1) if predicted_total else None,
-            "predicted_home_score": round(predicted_home_score, 1) if predicted_home_score else None,
-            "predicted_away_score": round(predicted_away_score, 1) if predicted_away_score else None,
-            "confidence": round(confidence, 4),
-        }
+        Args:
+            X: Feature matrix of shape (n_games, n_features), columns in FEATURE_ORDER
+                (NaN = missing)
 
-    def _prob_to_spread(self, prob: float) -> float:
+        Returns:
+            List of prediction dictionaries (same shape as predict)
         """
-        Convert win probability to predicted spread.
+        if self._column_order is not None:
+            X = X[:, self._column_order]
 
-        Uses inverse logistic function calibrated to NBA data.
-        ~60% = -3 points, ~70% = -6 points, ~80% = -10 points
+        return self._predict_matrix(X)
+
+    def _predict_matrix(self, X: np.ndarray) -> list[dict]:
+        """
+        Score a matrix in model column order, treating NaN as a missing feature.
 
         Args:
-            prob: Win probability (0-1)
+            X: Feature matrix in model column order (not modified)
 
         Returns:
-            Predicted spread (negative = favored)
+            List of prediction dictionaries
         """
-        # Avoid log(0) errors
-        prob = max(0.01, min(0.99, prob))
-
-        # Inverse logistic: spread = -k * ln(p / (1-p))
-        # Calibrated so 60% ≈ 3, 70% ≈ 6, 80% ≈ 10
-        k = 4.0  # Scaling factor
-
-        log_odds = math.log(prob / (1 - prob))
-        spread = -k * log_odds
+        missing = np.isnan(X)
+        if not missing.any():
+            return self._predictions_from_probs(self.predict_probs(X), X)
 
-        return spread
+        # The model sees missing features as 0.0; the score math uses its own defaults
+        home_win_prob = self.predict_probs(np.where(missing, 0.0, X))
+        return self._predictions_from_probs(home_win_prob, np.where(missing, self._score_defaults, X))
 
-    def get_feature_importance(self) -> dict[str, float]:
+    def _predictions_from_probs(self, home_win_prob: np.ndarray, X: np.ndarray) -> list[dict]:
         """
-        Get feature importance scores from the model.
+        Turn model probabilities plus the input rows into prediction dictionaries.
+
+        Args:
+            home_win_prob: Home win probability per game
+            X: Feature matrix in model column order (no NaN)
 
         Returns:
-            Dictionary mapping feature names to importance scores
+            List of prediction dictionaries
         """
-        importance = self.model.get_score(importance_type="gain")
-
-        # Normalize to sum to 1
-        total = sum(importance.values()) if importance else 1
-        normalized = {k: v / total for k, v in importance.items()}
+        def column(name: str) -> np.ndarray:
+            i = self._feature_index.get(name)
+            return X[:, i] if i is not None else np.full(len(X), SCORE_FEATURE_DEFAULTS[name])
+
+        out = _postprocess(
+            home_win_prob,
+            column("adj_nrtg_diff"),
+            column("projected_game_pace"),
+            column("home_adj_ortg"),
+            column("home_adj_drtg"),
+            column("away_adj_ortg"),
+            column("away_adj_drtg"),
+        )
+
+        # Round whole columns at once, then convert each to Python floats in one go
+        has_pace = out["has_pace"]
+        columns = {
+            name: np.round(out[name], decimals).tolist()
+            for name, decimals in PREDICTION_PRECISION.items()
+        }
 
-        return normalized
+        return [
+            {
+                "home_win_prob": hp,
+                "away_win_prob": ap,
+                "predicted_spread": sp,
+                "predicted_total": tot if ok and tot else None,
+                "predicted_home_score": hs if ok and hs else None,
+                "predicted_away_score": aws if ok and aws else None,
+                "confidence": conf,
+            }
+            for hp, ap, sp, tot, hs, aws, conf, ok in zip(
+                columns["home_win_prob"],
+                columns["away_win_prob"],
+                columns["predicted_spread"],
+                columns["predicted_total"],
+                columns["predicted_home_score"],
+                columns["predicted_away_score"],
+                columns["confidence"],
+                has_pace.tolist(),
+            )
+        ]
 
     def predict_batch(self, features_list: list[dict]) -> list[dict]:
         """
-        Generate predictions for multiple games.
+        Generate predictions for multiple games in one model call.
 
         Args:
             features_list: List of feature dictionaries
@@ -209,7 +385,7 @@ class XGBoostNBAModel:
         Returns:
             List of prediction dictionaries
         """
-        return [self.predict(f) for f in features_list]
+        return self._predict_matrix(self._prepare_features_batch(features_list))
 
 
 class FallbackModel:
@@ -224,20 +400,70 @@ class FallbackModel:
         adj_nrtg_diff = features.get("adj_nrtg_diff", 0)
 
         # Logistic function for probability
-        k = 0.15
-        home_win_prob = 1 / (1 + math.exp(-k * adj_nrtg_diff))
+        home_win_prob = 1 / (1 + math.exp(-WIN_PROB_K * adj_nrtg_diff))
         away_win_prob = 1 - home_win_prob
 
         confidence = abs(home_win_prob - 0.5) * 2
 
+        precision = PREDICTION_PRECISION
         return {
-            "home_win_prob": round(home_win_prob, 4),
-            "away_win_prob": round(away_win_prob, 4),
-            "predicted_spread": round(-adj_nrtg_diff, 1),
+            "home_win_prob": round(home_win_prob, precision["home_win_prob"]),
+            "away_win_prob": round(away_win_prob, precision["away_win_prob"]),
+            "predicted_spread": round(-adj_nrtg_diff, precision["predicted_spread"]),
             "predicted_total": None,
-            "confidence": round(confidence, 4),
+            "confidence": round(confidence, precision["confidence"]),
         }
 
     def predict_proba(self, features: dict) -> float:
         """Predict home win probability."""
         return self.predict(features)["home_win_prob"]
+
+    def predict_batch(self, features_list: list[dict]) -> list[dict]:
+        """
+        Generate predictions for multiple games in one vectorized pass.
+
+        Args:
+            features_list: List of feature dictionaries
+
+        Returns:
+            List of prediction dictionaries (same shape as predict)
+        """
+        adj_nrtg_diff = np.fromiter(
+            (f.get("adj_nrtg_diff") or 0.0 for f in features_list),
+            dtype=np.float64,
+            count=len(features_list),
+        )
+        return self._predict_nrtg(adj_nrtg_diff)
+
+    def predict_from_array(self, X: np.ndarray) -> list[dict]:
+        """
+        Generate predictions for a feature matrix (columns in FEATURE_ORDER).
+
+        Args:
+            X: Feature matrix of shape (n_games, n_features)
+
+        Returns:
+            List of prediction dictionaries (same shape as predict)
+        """
+        return self._predict_nrtg(X[:, FEATURE_INDEX["adj_nrtg_diff"]])
+
+    def _predict_nrtg(self, adj_nrtg_diff: np.ndarray) -> list[dict]:
+        """Build prediction dictionaries from net rating differentials."""
+        home_win_prob = nrtg_to_win_probability_vec(adj_nrtg_diff)
+        confidence = np.abs(home_win_prob - 0.5) * 2
+
+        return [
+            {
+                "home_win_prob": hp,
+                "away_win_prob": ap,
+                "predicted_spread": sp,
+                "predicted_total": None,
+                "confidence": conf,
+            }
+            for hp, ap, sp, conf in zip(
+                np.round(home_win_prob, PREDICTION_PRECISION["home_win_prob"]).tolist(),
+                np.round(1 - home_win_prob, PREDICTION_PRECISION["away_win_prob"]).tolist(),
+                np.round(-adj_nrtg_diff, PREDICTION_PRECISION["predicted_spread"]).tolist(),
+                np.round(confidence, PREDICTION_PRECISION["confidence"]).tolist(),
+            )
+        ]
@@ -2,20 +2,28 @@
 Basketball Reference scraper for BPM data.
 
 Rate limited to 20 requests per minute to respect the site's limits.
-Uses exponential backoff for retries.
+Uses exponential backoff for retries. Fetched pages are cached on disk,
+so repeat runs within the TTL skip both the network and the rate limit.
 """
 import asyncio
+import hashlib
+import logging
+import os
+import sys
 import time
+import zlib
 from typing import Optional
 from dataclasses import dataclass
 
 import httpx
-from bs4 import BeautifulSoup
-from ratelimit import limits, sleep_and_retry
+from lxml import etree
+from lxml import html as lxml_html
 
 from app.config import get_settings
+from app.scrapers.rate_limiter import AsyncRateLimiter
 
 settings = get_settings()
+logger = logging.getLogger(__name__)
 
 # Rate limiting: 20 requests per minute
 CALLS_PER_MINUTE = settings.bbref_rate_limit
@@ -28,12 +36,58 @@ TIMEOUT = 30
 MAX_RETRIES = 3
 BASE_DELAY = 2
 
+# Requests allowed in flight at once (the rate limit still caps throughput)
+MAX_CONCURRENT_REQUESTS = 8
 
-@dataclass
+# On-disk page cache
+CACHE_DIR = settings.bbref_cache_dir
+CACHE_TTL = settings.bbref_cache_ttl
+
+
+def _cache_path(url: str) -> str:
+    """File holding the cached body for url."""
+    return os.path.join(CACHE_DIR, hashlib.sha256(url.encode()).hexdigest() + ".html")
+
+
+def _read_cached_page(url: str) -> Optional[str]:
+    """Cached page body for url, or None if missing or older than CACHE_TTL."""
+    if not CACHE_DIR:
+        return None
+    path = _cache_path(url)
+    try:
+        if time.time() - os.stat(path).st_mtime > CACHE_TTL:
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+    except (OSError, UnicodeDecodeError) as e:
+        # An unreadable cache entry is just a miss
+        logger.warning("Could not read cached page %s: %s", path, e)
+        return None
+
+
+def _write_cached_page(url: str, html: str) -> None:
+    """Store a page body for url (atomic replace so readers never see a partial file)."""
+    if not CACHE_DIR:
+        return
+    path = _cache_path(url)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(html)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        # Caching is best effort; the fetched page is still returned
+        logger.warning("Could not cache page %s: %s", path, e)
+
+
+@dataclass(slots=True, frozen=True)
 class PlayerBPMData:
     """Player BPM data from Basketball Reference."""
 
-    player_id: int
+    player_id: str  # Basketball Reference slug, e.g. "tatumja01"
     player_name: str
     team_abbr: str
     season: int
@@ -44,8 +98,13 @@ class PlayerBPMData:
     dbpm: float
     vorp: float
 
+    @property
+    def player_id_num(self) -> int:
+        """Stable numeric ID (CRC32 of the slug; same across processes, unlike hash())."""
+        return zlib.crc32(self.player_id.encode())
+
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class TeamAdvancedStats:
     """Team advanced stats from Basketball Reference."""
 
@@ -70,6 +129,217 @@ class TeamAdvancedStats:
     opp_ftr: float
 
 
+# Precompiled XPath for the team page's advanced table
+_BPM_ROWS = etree.XPath(
+    '//table[@id="advanced"]/tbody/tr'
+    '[not(contains(concat(" ", normalize-space(@class), " "), " thead "))]'
+)
+_ROW_CELLS = etree.XPath("./th | ./td")
+_STAT_CELL = etree.XPath("./td[@data-stat=$name]")
+
+# Precompiled XPath for team misc stats and league averages
+_TEAM_MISC_DIV = etree.XPath('//div[@id="all_team_misc"]')
+_H1 = etree.XPath("//h1")
+_COMMENTS = etree.XPath(".//comment()")
+_TEAM_MISC_TABLE = etree.XPath('descendant-or-self::table[@id="team_misc"]')
+_TABLE_STAT_CELL = etree.XPath(".//td[@data-stat=$name]")
+_LEAGUE_AVG_ROW = etree.XPath('//table[@id="misc_stats"]/tfoot/tr[1]')
+
+
+def _stat_text(row, name: str) -> str:
+    """Stripped text of a row's td[data-stat=name], or "" if missing."""
+    cells = _STAT_CELL(row, name=name)
+    return cells[0].text_content().strip() if cells else ""
+
+
+def _parse_team_bpm(tree, team_abbr: str, season: int) -> list[PlayerBPMData]:
+    """
+    Parse player BPM rows from a team page.
+
+    Args:
+        tree: Parsed team page
+        team_abbr: Team abbreviation
+        season: Season year
+
+    Returns:
+        List of PlayerBPMData for all players on the team
+    """
+    players = []
+
+    for row in _BPM_ROWS(tree):
+        cells = _ROW_CELLS(row)
+        if len(cells) < 20:
+            continue
+
+        try:
+            # Extract player link for ID
+            player_link = cells[0].find(".//a")
+            if player_link is None:
+                continue
+
+            player_href = player_link.get("href", "")
+            # Extract player ID from href like /players/t/tatumja01.html
+            player_id_str = player_href.split("/")[-1].replace(".html", "")
+
+            # Get stats from cells
+            player_name = cells[0].text_content().strip()
+            games = int(cells[2].text_content().strip() or 0)
+            minutes = int(cells[3].text_content().strip() or 0)
+
+            # BPM columns are found by data-stat attribute
+            players.append(
+                PlayerBPMData(
+                    player_id=sys.intern(player_id_str),
+                    player_name=player_name,
+                    team_abbr=team_abbr,
+                    season=season,
+                    games_played=games,
+                    minutes_played=minutes,
+                    bpm=float(_stat_text(row, "bpm") or 0),
+                    obpm=float(_stat_text(row, "obpm") or 0),
+                    dbpm=float(_stat_text(row, "dbpm") or 0),
+                    vorp=float(_stat_text(row, "vorp") or 0),
+                )
+            )
+        except ValueError:
+            continue
+
+    return players
+
+
+def _text(element) -> str:
+    """Element text with each text node stripped and joined (like get_text(strip=True))."""
+    return "".join(part.strip() for part in element.itertext())
+
+
+def _parse_team_advanced_stats(tree, team_abbr: str, season: int) -> Optional[TeamAdvancedStats]:
+    """
+    Parse team advanced stats from a team page.
+
+    Args:
+        tree: Parsed team page
+        team_abbr: Team abbreviation
+        season: Season year
+
+    Returns:
+        TeamAdvancedStats or None if not found
+    """
+    # Find team stats in the team-stats div
+    divs = _TEAM_MISC_DIV(tree)
+    if not divs:
+        return None
+    team_stats_div = divs[0]
+
+    # The table usually ships inside an HTML comment; parse just that fragment
+    table = None
+    for comment in _COMMENTS(team_stats_div):
+        if comment.text and "team_misc" in comment.text:
+            tables = _TEAM_MISC_TABLE(lxml_html.fromstring(comment.text))
+            table = tables[0] if tables else None
+            break
+    else:
+        table = team_stats_div.find(".//table")
+
+    if table is None:
+        return None
+
+    # Extract values using data-stat attributes
+    def get_stat(stat_name: str, default: float = 0.0) -> float:
+        cells = _TABLE_STAT_CELL(table, name=stat_name)
+        if cells:
+            try:
+                return float(_text(cells[0]) or default)
+            except ValueError:
+                return default
+        return default
+
+    headings = _H1(tree)
+
+    return TeamAdvancedStats(
+        team_abbr=team_abbr,
+        team_name=_text(headings[0]) if headings else team_abbr,
+        season=season,
+        off_rating=get_stat("off_rtg"),
+        def_rating=get_stat("def_rtg"),
+        net_rating=get_stat("net_rtg"),
+        pace=get_stat("pace"),
+        efg_pct=get_stat("efg_pct"),
+        tov_pct=get_stat("tov_pct"),
+        oreb_pct=get_stat("orb_pct"),
+        ftr=get_stat("ft_rate"),
+        opp_efg_pct=get_stat("opp_efg_pct"),
+        opp_tov_pct=get_stat("opp_tov_pct"),
+        opp_oreb_pct=get_stat("opp_orb_pct"),
+        opp_ftr=get_stat("opp_ft_rate"),
+    )
+
+
+def _parse_team_page(
+    html: str, team_abbr: str, season: int
+) -> tuple[list[PlayerBPMData], Optional[TeamAdvancedStats]]:
+    """
+    Parse a team page once and extract both player BPM and team advanced stats.
+
+    Args:
+        html: Team page HTML
+        team_abbr: Team abbreviation
+        season: Season year
+
+    Returns:
+        Tuple of (player BPM list, team advanced stats or None)
+    """
+    try:
+        tree = lxml_html.fromstring(html)
+    except etree.ParserError:
+        return [], None
+
+    return (
+        _parse_team_bpm(tree, team_abbr, season),
+        _parse_team_advanced_stats(tree, team_abbr, season),
+    )
+
+
+def _parse_league_averages(html: str) -> dict:
+    """
+    Parse league average ratings and pace from a league season page.
+
+    Args:
+        html: League season page HTML
+
+    Returns:
+        Dictionary with league average stats (defaults if not found)
+    """
+    # Default values if scraping fails
+    defaults = {
+        "avg_ortg": 110.0,
+        "avg_drtg": 110.0,
+        "avg_pace": 100.0,
+    }
+
+    try:
+        tree = lxml_html.fromstring(html)
+    except etree.ParserError:
+        return defaults
+
+    # League average is the first row of the misc stats table footer
+    rows = _LEAGUE_AVG_ROW(tree)
+    if not rows:
+        return defaults
+
+    def get_stat(stat_name: str, default: float) -> float:
+        cells = _TABLE_STAT_CELL(rows[0], name=stat_name)
+        return float(_text(cells[0])) if cells else default
+
+    try:
+        return {
+            "avg_ortg": get_stat("off_rtg", 110.0),
+            "avg_drtg": get_stat("def_rtg", 110.0),
+            "avg_pace": get_stat("pace", 100.0),
+        }
+    except ValueError:
+        return defaults
+
+
 class BasketballReferenceScraper:
     """Scraper for Basketball Reference advanced stats."""
 
@@ -77,6 +347,9 @@ class BasketballReferenceScraper:
         self.base_url = settings.bbref_base_url
         self.session: Optional[httpx.AsyncClient] = None
         self.last_request_time = 0
+        self._sem = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+        self._limiter = AsyncRateLimiter(CALLS_PER_MINUTE, ONE_MINUTE)
+        self._team_pages: dict[tuple[str, int], asyncio.Future] = {}
 
     async def __aenter__(self):
         self.session = httpx.AsyncClient(
@@ -91,116 +364,103 @@ class BasketballReferenceScraper:
         if self.session:
             await self.session.aclose()
 
-    @sleep_and_retry
-    @limits(calls=CALLS_PER_MINUTE, period=ONE_MINUTE)
+    async def _fetch(self, url: str) -> str:
+        """Return the page at url, from the disk cache if fresh, else over the network."""
+        # Disk I/O runs in a worker thread so it doesn't stall other fetches
+        html = await asyncio.to_thread(_read_cached_page, url)
+        if html is not None:
+            return html
+
+        html = await self._rate_limited_request(url)
+        await asyncio.to_thread(_write_cached_page, url, html)
+        return html
+
     async def _rate_limited_request(self, url: str) -> str:
         """Make a rate-limited request with retries."""
         if not self.session:
             raise RuntimeError("Scraper session not initialized")
 
-        for attempt in range(MAX_RETRIES):
-            try:
-                response = await self.session.get(url)
-                response.raise_for_status()
-                return response.text
-            except httpx.HTTPStatusError as e:
-                if e.response.status_code == 429:
-                    # Rate limited - wait and retry
-                    delay = BASE_DELAY * (2 ** attempt)
-                    await asyncio.sleep(delay)
-                elif e.response.status_code >= 500:
-                    # Server error - retry
-                    delay = BASE_DELAY * (2 ** attempt)
-                    await asyncio.sleep(delay)
-                else:
-                    raise
-            except httpx.RequestError:
-                if attempt < MAX_RETRIES - 1:
-                    delay = BASE_DELAY * (2 ** attempt)
-                    await asyncio.sleep(delay)
-                else:
-                    raise
+        async with self._sem:
+            for attempt in range(MAX_RETRIES):
+                try:
+                    # Every attempt, retries included, takes a rate-limit slot
+                    async with self._limiter:
+                        response = await self.session.get(url)
+                    response.raise_for_status()
+                    return response.text
+                except httpx.HTTPStatusError as e:
+                    if e.response.status_code == 429:
+                        # Rate limited - wait and retry
+                        delay = BASE_DELAY * (2 ** attempt)
+                        await asyncio.sleep(delay)
+                    elif e.response.status_code >= 500:
+                        # Server error - retry
+                        delay = BASE_DELAY * (2 ** attempt)
+                        await asyncio.sleep(delay)
+                    else:
+                        raise
+                except httpx.RequestError:
+                    if attempt < MAX_RETRIES - 1:
+                        delay = BASE_DELAY * (2 ** attempt)
+                        await asyncio.sleep(delay)
+                    else:
+                        raise
 
         raise RuntimeError(f"Failed to fetch {url} after {MAX_RETRIES} retries")
 
-    async def scrape_team_bpm(self, team_abbr: str, season: int) -> list[PlayerBPMData]:
+    async def scrape_team_page(
+        self, team_abbr: str, season: int
+    ) -> tuple[list[PlayerBPMData], Optional[TeamAdvancedStats]]:
         """
-        Scrape BPM data for all players on a team.
+        Scrape a team page once for both player BPM and team advanced stats.
+
+        The result is memoized per (team, season) for the life of the scraper,
+        and concurrent callers share a single in-flight fetch.
 
         Args:
             team_abbr: Team abbreviation (e.g., "BOS", "LAL")
             season: Season year (e.g., 2024 for 2023-24 season)
 
         Returns:
-            List of PlayerBPMData for all players on the team
+            Tuple of (player BPM list, team advanced stats or None)
         """
+        key = (team_abbr, season)
+        task = self._team_pages.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._scrape_team_page(team_abbr, season))
+            task.add_done_callback(lambda t: self._forget_failed_page(key, t))
+            self._team_pages[key] = task
+
+        # Shield the shared fetch so one cancelled caller doesn't cancel it for all
+        return await asyncio.shield(task)
+
+    def _forget_failed_page(self, key: tuple[str, int], task: asyncio.Future) -> None:
+        """Drop a failed or cancelled fetch from the memo so the next call retries."""
+        if (task.cancelled() or task.exception() is not None) and self._team_pages.get(key) is task:
+            del self._team_pages[key]
+
+    async def _scrape_team_page(
+        self, team_abbr: str, season: int
+    ) -> tuple[list[PlayerBPMData], Optional[TeamAdvancedStats]]:
+        """Fetch and parse a team page (uncached; see scrape_team_page)."""
         url = f"{self.base_url}/teams/{team_abbr}/{season}.html"
-        html = await self._rate_limited_request(url)
-
-        soup = BeautifulSoup(html, "lxml")
-        players = []
+        html = await self._fetch(url)
 
-        # Find the advanced stats table
-        advanced_table = soup.find("table", {"id": "advanced"})
-        if not advanced_table:
-            return []
+        # Parsing is CPU-bound; keep it off the event loop so other fetches proceed
+        return await asyncio.to_thread(_parse_team_page, html, team_abbr, season)
 
-        tbody = advanced_table.find("tbody")
-        if not tbody:
-            return []
-
-        for row in tbody.find_all("tr"):
-            if "thead" in row.get("class", []):
-                continue
-
-            cells = row.find_all(["th", "td"])
-            if len(cells) < 20:
-                continue
+    async def scrape_team_bpm(self, team_abbr: str, season: int) -> list[PlayerBPMData]:
+        """
+        Scrape BPM data for all players on a team.
 
-            try:
-                # Extract player link for ID
-                player_link = cells[0].find("a")
-                if not player_link:
-                    continue
-
-                player_href = player_link.get("href", "")
-                # Extract player ID from href like /players/t/tatumja01.html
-                player_id_str = player_href.split("/")[-1].replace(".html", "")
-
-                # Get stats from cells
-                player_name = cells[0].get_text(strip=True)
-                games = int(cells[2].get_text(strip=True) or 0)
-                minutes = int(cells[3].get_text(strip=True) or 0)
-
-                # BPM columns are typically near the end
-                # Find by data-stat attribute
-                bpm_cell = row.find("td", {"data-stat": "bpm"})
-                obpm_cell = row.find("td", {"data-stat": "obpm"})
-                dbpm_cell = row.find("td", {"data-stat": "dbpm"})
-                vorp_cell = row.find("td", {"data-stat": "vorp"})
-
-                bpm = float(bpm_cell.get_text(strip=True) or 0) if bpm_cell else 0.0
-                obpm = float(obpm_cell.get_text(strip=True) or 0) if obpm_cell else 0.0
-                dbpm = float(dbpm_cell.get_text(strip=True) or 0) if dbpm_cell else 0.0
-                vorp = float(vorp_cell.get_text(strip=True) or 0) if vorp_cell else 0.0
-
-                players.append(
-                    PlayerBPMData(
-                        player_id=hash(player_id_str),  # Use hash of string ID
-                        player_name=player_name,
-                        team_abbr=team_abbr,
-                        season=season,
-                        games_played=games,
-                        minutes_played=minutes,
-                        bpm=bpm,
-                        obpm=obpm,
-                        dbpm=dbpm,
-                        vorp=vorp,
-                    )
-                )
-            except (ValueError, AttributeError):
-                continue
+        Args:
+            team_abbr: Team abbreviation (e.g., "BOS", "LAL")
+            season: Season year (e.g., 2024 for 2023-24 season)
 
+        Returns:
+            List of PlayerBPMData for all players on the team
+        """
+        players, _ = await self.scrape_team_page(team_abbr, season)
         return players
 
     async def scrape_team_advanced_stats(self, team_abbr: str, season: int) -> Optional[TeamAdvancedStats]:
@@ -214,57 +474,8 @@ class BasketballReferenceScraper:
         Returns:
             TeamAdvancedStats or None if not found
         """
-        url = f"{self.base_url}/teams/{team_abbr}/{season}.html"
-        html = await self._rate_limited_request(url)
-
-        soup = BeautifulSoup(html, "lxml")
-
-        # Find team stats in the team-stats div
-        team_stats_div = soup.find("div", {"id": "all_team_misc"})
-        if not team_stats_div:
-            return None
-
-        # Parse the comment containing the table
-        comment = team_stats_div.find(string=lambda text: isinstance(text, str) and "team_misc" in text)
-        if comment:
-            comment_soup = BeautifulSoup(comment, "lxml")
-            table = comment_soup.find("table", {"id": "team_misc"})
-        else:
-            table = team_stats_div.find("table")
-
-        if not table:
-            return None
-
-        try:
-            # Extract values using data-stat attributes
-            def get_stat(stat_name: str, default: float = 0.0) -> float:
-                cell = table.find("td", {"data-stat": stat_name})
-                if cell:
-                    try:
-                        return float(cell.get_text(strip=True) or default)
-                    except ValueError:
-                        return default
-                return default
-
-            return TeamAdvancedStats(
-                team_abbr=team_abbr,
-                team_name=soup.find("h1").get_text(strip=True) if soup.find("h1") else team_abbr,
-                season=season,
-                off_rating=get_stat("off_rtg"),
-                def_rating=get_stat("def_rtg"),
-                net_rating=get_stat("net_rtg"),
-                pace=get_stat("pace"),
-                efg_pct=get_stat("efg_pct"),
-                tov_pct=get_stat("tov_pct"),
-                oreb_pct=get_stat("orb_pct"),
-                ftr=get_stat("ft_rate"),
-                opp_efg_pct=get_stat("opp_efg_pct"),
-                opp_tov_pct=get_stat("opp_tov_pct"),
-                opp_oreb_pct=get_stat("opp_orb_pct"),
-                opp_ftr=get_stat("opp_ft_rate"),
-            )
-        except (ValueError, AttributeError):
-            return None
+        _, stats = await self.scrape_team_page(team_abbr, season)
+        return stats
 
     async def scrape_league_averages(self, season: int) -> dict:
         """
@@ -277,41 +488,9 @@ class BasketballReferenceScraper:
             Dictionary with league average stats
         """
         url = f"{self.base_url}/leagues/NBA_{season}.html"
-        html = await self._rate_limited_request(url)
-
-        soup = BeautifulSoup(html, "lxml")
-
-        # Default values if scraping fails
-        defaults = {
-            "avg_ortg": 110.0,
-            "avg_drtg": 110.0,
-            "avg_pace": 100.0,
-        }
-
-        try:
-            # Find league stats table
-            misc_table = soup.find("table", {"id": "misc_stats"})
-            if not misc_table:
-                return defaults
-
-            # League average is typically in the last row or in a summary
-            tfoot = misc_table.find("tfoot")
-            if tfoot:
-                row = tfoot.find("tr")
-                if row:
-                    ortg_cell = row.find("td", {"data-stat": "off_rtg"})
-                    drtg_cell = row.find("td", {"data-stat": "def_rtg"})
-                    pace_cell = row.find("td", {"data-stat": "pace"})
-
-                    return {
-                        "avg_ortg": float(ortg_cell.get_text(strip=True)) if ortg_cell else 110.0,
-                        "avg_drtg": float(drtg_cell.get_text(strip=True)) if drtg_cell else 110.0,
-                        "avg_pace": float(pace_cell.get_text(strip=True)) if pace_cell else 100.0,
-                    }
-        except (ValueError, AttributeError):
-            pass
+        html = await self._fetch(url)
 
-        return defaults
+        return await asyncio.to_thread(_parse_league_averages, html)
 
     async def scrape_all_teams_bpm(self, season: int) -> dict[str, list[PlayerBPMData]]:
         """
@@ -329,14 +508,18 @@ class BasketballReferenceScraper:
             "OKC", "ORL", "PHI", "PHO", "POR", "SAC", "SAS", "TOR", "UTA", "WAS",
         ]
 
+        # Overlap the requests; the semaphore and rate limit bound concurrency
+        scraped = await asyncio.gather(
+            *(self.scrape_team_bpm(team, season) for team in teams),
+            return_exceptions=True,
+        )
+
         results = {}
-        for team in teams:
-            try:
-                players = await self.scrape_team_bpm(team, season)
-                results[team] = players
-            except Exception as e:
-                print(f"Error scraping {team}: {e}")
-                results[team] = []
+        for team, players in zip(teams, scraped):
+            if isinstance(players, Exception):
+                logger.warning("Error scraping %s: %s", team, players)
+                players = []
+            results[team] = players
 
         return results
 
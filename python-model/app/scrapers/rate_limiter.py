@@ -0,0 +1,46 @@
+"""
+Async-native rate limiting for scrapers.
+
+Waiting for a free slot awaits asyncio.sleep, so other coroutines keep
+running while a request is held back (unlike ratelimit's time.sleep).
+"""
+import asyncio
+import time
+from collections import deque
+
+
+class AsyncRateLimiter:
+    """Sliding-window limiter allowing at most `calls` acquisitions per `period` seconds."""
+
+    def __init__(self, calls: int, period: float):
+        """
+        Initialize the limiter.
+
+        Args:
+            calls: Maximum acquisitions per window
+            period: Window length in seconds
+        """
+        self.calls = calls
+        self.period = period
+        self._times: deque[float] = deque()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """Wait until a slot is free in the current window, then take it."""
+        # Waiters queue on the lock, so slots are handed out in arrival order
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                while self._times and now - self._times[0] >= self.period:
+                    self._times.popleft()
+                if len(self._times) < self.calls:
+                    self._times.append(now)
+                    return
+                await asyncio.sleep(self._times[0] + self.period - now)
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        return None
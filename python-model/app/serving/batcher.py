@@ -0,0 +1,132 @@
+"""
+Micro-batching for single-game predictions.
+
+Concurrent /predict calls are buffered for a few milliseconds and scored
+together with a single model call, amortizing XGBoost's per-call overhead.
+"""
+import asyncio
+from concurrent.futures import Executor
+from typing import Optional
+
+import numpy as np
+
+from app.models.xgboost_model import XGBoostNBAModel, FEATURE_ORDER
+
+
+class BatchPredictor:
+    """Coalesces concurrent single-game predictions into batched model calls."""
+
+    def __init__(
+        self,
+        model: XGBoostNBAModel,
+        max_batch: int = 32,
+        max_delay: float = 0.005,
+        executor: Optional[Executor] = None,
+    ):
+        """
+        Initialize the batcher.
+
+        Args:
+            model: Loaded model used for predictions
+            max_batch: Maximum games scored per model call
+            max_delay: Maximum time (seconds) to wait for a batch to fill
+            executor: Executor that runs model calls (None = loop default)
+        """
+        self.model = model
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.executor = executor
+        # Reused feature matrix. Safe only because _run awaits each batch's
+        # predict_from_array, which returns plain Python lists holding no view
+        # of the buffer, before the next batch is stacked into it
+        self._buffer = np.empty((max_batch, len(FEATURE_ORDER)), dtype=np.float64)
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """Start the background worker on the running event loop."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the worker and fail any requests still in flight or queued."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        while not self._queue.empty():
+            _fail_stopped([self._queue.get_nowait()])
+
+    async def submit(self, features: np.ndarray) -> asyncio.Future:
+        """
+        Queue one game's feature row for prediction.
+
+        Args:
+            features: 1-D feature row in FEATURE_ORDER
+
+        Returns:
+            Future resolving to the prediction dictionary
+        """
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((features, future))
+        return future
+
+    async def _run(self) -> None:
+        """Collect queued requests into batches and score them."""
+        loop = asyncio.get_running_loop()
+        batch = []
+
+        try:
+            while True:
+                batch = [await self._queue.get()]
+                deadline = loop.time() + self.max_delay
+
+                while len(batch) < self.max_batch:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+
+                await self._process(batch)
+        finally:
+            # Cancelled mid-collection or mid-model-call: these requests are
+            # off the queue, so stop() can't reach them
+            _fail_stopped(batch)
+
+    async def _process(self, batch: list[tuple[np.ndarray, asyncio.Future]]) -> None:
+        """Score one batch off the event loop and resolve its futures."""
+        pending = [(features, future) for features, future in batch if not future.done()]
+        if not pending:
+            return
+
+        try:
+            X = np.stack(
+                [features for features, _ in pending],
+                out=self._buffer[: len(pending)],
+            )
+            predictions = await asyncio.get_running_loop().run_in_executor(
+                self.executor, self.model.predict_from_array, X
+            )
+        except Exception as e:
+            for _, future in pending:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), prediction in zip(pending, predictions):
+            if not future.done():
+                future.set_result(prediction)
+
+
+def _fail_stopped(batch: list[tuple[np.ndarray, asyncio.Future]]) -> None:
+    """Fail every unresolved future in batch because the batcher stopped."""
+    for _, future in batch:
+        if not future.done():
+            future.set_exception(RuntimeError("Batch predictor stopped"))
@@ -0,0 +1,62 @@
+"""
+Probabilistic memoization for repeatedly requested feature bundles.
+
+Only a fraction p of misses are stored, spread evenly by a deterministic
+accumulator. Keys requested many times (e.g. a game polled during live
+odds updates) end up cached after a few hits, while one-off keys mostly
+never take up memory.
+"""
+from typing import Any, Callable, Hashable
+
+
+class ProbCache:
+    """Dict cache that stores roughly one in every 1/p misses."""
+
+    def __init__(self, p: float = 0.3, max_size: int = 4096):
+        """
+        Initialize the cache.
+
+        Args:
+            p: Fraction of misses to store (0-1)
+            max_size: Maximum stored entries; the oldest is evicted to make room
+        """
+        self.p = p
+        self.max_size = max_size
+        self._store: dict[Hashable, Any] = {}
+        self._acc = 0.0
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """
+        Return the cached value for key, computing (and maybe storing) it on a miss.
+
+        Args:
+            key: Hashable cache key
+            compute: Zero-argument function producing the value
+
+        Returns:
+            Cached or freshly computed value
+        """
+        try:
+            return self._store[key]
+        except KeyError:
+            pass
+
+        value = compute()
+
+        self._acc += self.p
+        if self._acc >= 1.0:
+            self._acc -= 1.0
+            if len(self._store) >= self.max_size:
+                # Dicts keep insertion order, so the first key is the oldest
+                del self._store[next(iter(self._store))]
+            self._store[key] = value
+
+        return value
+
+    def __len__(self) -> int:
+        return len(self._store)
+
+    def clear(self) -> None:
+        """Drop all stored entries."""
+        self._store.clear()
+        self._acc = 0.0
@@ -0,0 +1,111 @@
+"""
+Tests for the micro-batching predictor.
+"""
+import asyncio
+import threading
+
+import numpy as np
+import pytest
+
+from app.models.xgboost_model import FEATURE_ORDER
+from app.serving.batcher import BatchPredictor
+
+
+class FakeModel:
+    """Records batch sizes and echoes each row's first feature."""
+
+    def __init__(self, error: Exception = None, gate: threading.Event = None):
+        self.batch_sizes = []
+        self.error = error
+        self.gate = gate
+        self.called = threading.Event()
+
+    def predict_from_array(self, X):
+        self.called.set()
+        if self.gate is not None:
+            self.gate.wait(5)
+        self.batch_sizes.append(len(X))
+        if self.error is not None:
+            raise self.error
+        return [{"row": float(x)} for x in X[:, 0]]
+
+
+def _row(value: float) -> np.ndarray:
+    return np.full(len(FEATURE_ORDER), value)
+
+
+async def _predict_all(batcher, values):
+    futures = [await batcher.submit(_row(v)) for v in values]
+    return await asyncio.gather(*futures, return_exceptions=True)
+
+
+class TestBatchPredictor:
+    @pytest.mark.asyncio
+    async def test_coalesces_concurrent_requests(self):
+        model = FakeModel()
+        batcher = BatchPredictor(model, max_batch=32, max_delay=0.05)
+        batcher.start()
+        try:
+            results = await _predict_all(batcher, range(5))
+        finally:
+            await batcher.stop()
+
+        assert model.batch_sizes == [5]
+        assert [r["row"] for r in results] == [0, 1, 2, 3, 4]
+
+    @pytest.mark.asyncio
+    async def test_max_batch_splits_batches(self):
+        model = FakeModel()
+        batcher = BatchPredictor(model, max_batch=2, max_delay=0.05)
+        batcher.start()
+        try:
+            results = await _predict_all(batcher, range(5))
+        finally:
+            await batcher.stop()
+
+        assert model.batch_sizes == [2, 2, 1]
+        assert [r["row"] for r in results] == [0, 1, 2, 3, 4]
+
+    @pytest.mark.asyncio
+    async def test_max_delay_flushes_partial_batch(self):
+        model = FakeModel()
+        batcher = BatchPredictor(model, max_batch=32, max_delay=0.01)
+        batcher.start()
+        try:
+            first = await batcher.submit(_row(0))
+            await asyncio.sleep(0.1)
+            assert first.done()
+            second = await batcher.submit(_row(1))
+            assert (await second)["row"] == 1
+        finally:
+            await batcher.stop()
+
+        assert model.batch_sizes == [1, 1]
+
+    @pytest.mark.asyncio
+    async def test_model_error_fans_out(self):
+        error = ValueError("bad batch")
+        batcher = BatchPredictor(FakeModel(error=error), max_batch=32, max_delay=0.05)
+        batcher.start()
+        try:
+            results = await _predict_all(batcher, range(3))
+        finally:
+            await batcher.stop()
+
+        assert all(r is error for r in results)
+
+    @pytest.mark.asyncio
+    async def test_stop_fails_in_flight_batch(self):
+        gate = threading.Event()
+        model = FakeModel(gate=gate)
+        batcher = BatchPredictor(model, max_batch=32, max_delay=0.0)
+        batcher.start()
+        try:
+            future = await batcher.submit(_row(0))
+            await asyncio.to_thread(model.called.wait, 5)
+            await batcher.stop()
+
+            with pytest.raises(RuntimeError, match="stopped"):
+                await asyncio.wait_for(future, 1)
+        finally:
+            gate.set()
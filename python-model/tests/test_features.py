@@ -1,54 +1,64 @@
 """
 Tests for feature engineering modules.
 """
+import numpy as np
 import pytest
 from app.features.adjusted_rating import (
     calculate_adjusted_ortg,
     calculate_adjusted_drtg,
     calculate_adjusted_ratings,
+    calculate_adjusted_ratings_vec,
     nrtg_to_win_probability,
+    nrtg_to_win_probability_vec,
 )
 from app.features.four_factors import (
     calculate_efg,
     calculate_tov_pct,
     calculate_four_factors_differential,
+    calculate_four_factors_differential_vec,
 )
 from app.features.pace_metrics import (
     calculate_possessions,
     calculate_pace,
     project_game_pace,
+    project_game_total,
+    project_game_total_vec,
+    calculate_pace_ratings_vec,
     calculate_pace_metrics,
 )
 from app.features.player_impact import (
     calculate_team_bpm,
     calculate_top_n_bpm,
     calculate_bpm_differential,
+    calculate_injury_adjusted_bpm,
+    roster_to_soa,
 )
 from app.features.line_movement import (
     calculate_spread_movement,
     calculate_line_movement_features,
+    calculate_line_movement_features_vec,
     classify_line_movement,
+    lines_to_array,
+    SPREAD_DIRECTIONS,
 )
+from app.serving.prob_cache import ProbCache
 
 
 class TestAdjustedRatings:
-    def test_adjusted_ortg_tough_schedule(self):
-        """Team with tough schedule (low SOS DRTG) should get boost."""
+    @pytest.mark.parametrize(
+        "sos_drtg,expected_sign",
+        [
+            (105.0, 1),  # Faced tough defenses: boosted
+            (115.0, -1),  # Faced weak defenses: penalized
+        ],
+    )
+    def test_adjusted_ortg_schedule(self, sos_drtg, expected_sign):
+        """Tough schedules (low SOS DRTG) boost ORTG, easy ones penalize it."""
         raw_ortg = 110.0
-        sos_drtg = 105.0  # Faced tough defenses
         league_avg = 110.0
 
         adj_ortg = calculate_adjusted_ortg(raw_ortg, sos_drtg, league_avg)
-        assert adj_ortg > raw_ortg  # Should be boosted
-
-    def test_adjusted_ortg_easy_schedule(self):
-        """Team with easy schedule (high SOS DRTG) should be penalized."""
-        raw_ortg = 110.0
-        sos_drtg = 115.0  # Faced weak defenses
-        league_avg = 110.0
-
-        adj_ortg = calculate_adjusted_ortg(raw_ortg, sos_drtg, league_avg)
-        assert adj_ortg < raw_ortg  # Should be penalized
+        assert (adj_ortg - raw_ortg) * expected_sign > 0
 
     def test_adjusted_ratings_home_advantage(self):
         """Home team should get ~3.5 point advantage."""
@@ -60,21 +70,62 @@ class TestAdjustedRatings:
         )
 
         # With equal ratings, home advantage should be ~3.5
-        assert abs(result["adj_nrtg_diff"] - 3.5) < 0.1
+        assert abs(result.adj_nrtg_diff - 3.5) < 0.1
 
-    def test_nrtg_to_probability(self):
-        """Test probability conversion."""
-        # Equal teams + home court = ~60% for home
-        prob = nrtg_to_win_probability(3.5)
-        assert 0.55 < prob < 0.65
+    def test_adjusted_ratings_vec_matches_scalar(self):
+        """Vectorized ratings pick precomputed, SOS, or raw values per game."""
+        nan = np.nan
+        result = calculate_adjusted_ratings_vec(
+            home_ortg=np.array([112.0, 112.0, 112.0]),
+            home_drtg=np.array([108.0, 108.0, 108.0]),
+            away_ortg=np.array([110.0, 110.0, 110.0]),
+            away_drtg=np.array([111.0, 111.0, 111.0]),
+            home_sos_ortg=np.array([nan, 111.0, 111.0]),
+            home_sos_drtg=np.array([nan, 109.0, 109.0]),
+            away_sos_ortg=np.array([nan, nan, 108.0]),
+            away_sos_drtg=np.array([nan, nan, 112.0]),
+            league_avg_ortg=np.full(3, 110.0),
+            league_avg_drtg=np.full(3, 110.0),
+            home_adj_ortg=np.array([nan, nan, 115.0]),
+            home_adj_drtg=np.array([nan, nan, 105.0]),
+            away_adj_ortg=np.full(3, nan),
+            away_adj_drtg=np.full(3, nan),
+        )
+
+        expected = [
+            calculate_adjusted_ratings(112.0, 108.0, 110.0, 111.0),
+            calculate_adjusted_ratings(
+                112.0, 108.0, 110.0, 111.0,
+                home_sos_ortg=111.0, home_sos_drtg=109.0,
+            ),
+            calculate_adjusted_ratings(
+                112.0, 108.0, 110.0, 111.0,
+                away_sos_ortg=108.0, away_sos_drtg=112.0,
+                home_adj_ortg=115.0, home_adj_drtg=105.0,
+            ),
+        ]
+        for i, scalar in enumerate(expected):
+            assert result["adj_nrtg_diff"][i] == pytest.approx(scalar.adj_nrtg_diff)
+            assert result["home_adj_ortg"][i] == pytest.approx(scalar.home_adj_ortg)
+            assert result["away_adj_drtg"][i] == pytest.approx(scalar.away_adj_drtg)
 
-        # Large advantage = high probability
-        prob_big = nrtg_to_win_probability(15.0)
-        assert prob_big > 0.85
+    @pytest.mark.parametrize(
+        "nrtg_diff,low,high",
+        [
+            (3.5, 0.55, 0.65),  # Equal teams + home court = ~60% for home
+            (15.0, 0.85, 1.0),  # Large advantage = high probability
+            (-15.0, 0.0, 0.15),  # Big disadvantage = low probability
+        ],
+    )
+    def test_nrtg_to_probability(self, nrtg_diff, low, high):
+        """Test probability conversion."""
+        assert low < nrtg_to_win_probability(nrtg_diff) < high
 
-        # Big disadvantage = low probability
-        prob_low = nrtg_to_win_probability(-15.0)
-        assert prob_low < 0.15
+    def test_nrtg_to_probability_vec_matches_scalar(self):
+        """Vectorized probabilities agree with the scalar logistic."""
+        diffs = [-15.0, 0.0, 3.5, 15.0]
+        result = nrtg_to_win_probability_vec(np.array(diffs))
+        assert result == pytest.approx([nrtg_to_win_probability(d) for d in diffs])
 
 
 class TestFourFactors:
@@ -103,9 +154,27 @@ class TestFourFactors:
         )
 
         # Home team is better in all factors
-        assert result["efg_diff"] > 0
-        assert result["tov_diff"] > 0  # Away has more turnovers = good for home
-        assert result["composite"] > 0
+        assert result.efg_diff > 0
+        assert result.tov_diff > 0  # Away has more turnovers = good for home
+        assert result.composite > 0
+
+    def test_four_factors_differential_vec_matches_scalar(self):
+        """Vectorized differentials agree with the scalar version."""
+        home = dict(efg=0.55, tov=0.12, oreb=0.28, ftr=0.28,
+                    opp_efg=0.50, opp_tov=0.15, opp_oreb=0.24, opp_ftr=0.22)
+        away = dict(efg=0.50, tov=0.15, oreb=0.24, ftr=0.22,
+                    opp_efg=0.55, opp_tov=0.12, opp_oreb=0.28, opp_ftr=0.28)
+        scalar = calculate_four_factors_differential(
+            **{f"home_{k}": v for k, v in home.items()},
+            **{f"away_{k}": v for k, v in away.items()},
+        )
+        result = calculate_four_factors_differential_vec(
+            **{f"home_{k}": np.array([v, v]) for k, v in home.items()},
+            **{f"away_{k}": np.array([v, v]) for k, v in away.items()},
+        )
+
+        for key, value in scalar._asdict().items():
+            assert result[key] == pytest.approx([value, value])
 
 
 class TestPaceMetrics:
@@ -122,17 +191,46 @@ class TestPaceMetrics:
         pace = calculate_pace(possessions=93.8, minutes=48.0)
         assert abs(pace - 93.8) < 0.1
 
+    def test_pace_ratings_vec(self):
+        """Fused batch ratings match the scalar formulas, including zero guards."""
+        possessions, pace, points_per_100 = calculate_pace_ratings_vec(
+            fga=np.array([80, 0]),
+            oreb=np.array([10, 0]),
+            tov=np.array([15, 0]),
+            fta=np.array([20, 0]),
+            points=np.array([110, 0]),
+            minutes=np.array([48.0, 0.0]),
+        )
+        assert possessions[0] == pytest.approx(calculate_possessions(fga=80, oreb=10, tov=15, fta=20))
+        assert pace.tolist() == [pytest.approx(93.8), 0.0]
+        assert points_per_100.tolist() == [pytest.approx(110 / 93.8 * 100), 0.0]
+
     def test_game_pace_projection(self):
         """Test projected game pace."""
         # Fast team (105) vs slow team (95) = ~100 average
         projected = project_game_pace(home_pace=105, away_pace=95, league_avg_pace=100)
         assert 99 < projected < 101
 
+    def test_game_total_projection(self):
+        """Test projected total and its vectorized variant."""
+        # (115 + 110) / 2 and (110 + 112) / 2 per 100 over 100 possessions, +1.5 home
+        total = project_game_total(115.0, 112.0, 110.0, 110.0, projected_pace=100.0)
+        assert total == pytest.approx(225.0)
+
+        # Unrounded: 447 * 95.5 * 0.005 + 1.5 = 214.9425
+        assert project_game_total(115.0, 112.0, 110.0, 110.0, projected_pace=95.5) == pytest.approx(214.9425)
+
+        paces = np.array([95.0, 100.0, 105.0])
+        result = project_game_total_vec(115.0, 112.0, 110.0, 110.0, paces)
+        assert result.tolist() == pytest.approx(
+            [project_game_total(115.0, 112.0, 110.0, 110.0, p) for p in paces]
+        )
+
     def test_pace_metrics(self):
         """Test full pace metrics calculation."""
         result = calculate_pace_metrics(home_pace=102, away_pace=98)
-        assert result["pace_diff"] == 4.0
-        assert 99 < result["projected_pace"] < 101
+        assert result.pace_diff == 4.0
+        assert 99 < result.projected_pace < 101
 
 
 class TestPlayerImpact:
@@ -161,6 +259,17 @@ class TestPlayerImpact:
         # Average of top 5: (8+5+3+1-1)/5 = 3.2
         assert abs(top_5 - 3.2) < 0.1
 
+    def test_injury_adjusted_bpm(self):
+        """Injured players count at replacement level; SoA input matches dicts."""
+        players = [
+            {"player_id": "tatumja01", "bpm": 6.0, "minutes": 1000},
+            {"player_id": "brownja02", "bpm": 1.0, "minutes": 1000},
+        ]
+        # (-2.0 * 1000 + 1.0 * 1000) / 2000 = -0.5
+        assert calculate_injury_adjusted_bpm(players, ["tatumja01"]) == pytest.approx(-0.5)
+        assert calculate_injury_adjusted_bpm(roster_to_soa(players), ["tatumja01"]) == pytest.approx(-0.5)
+        assert calculate_injury_adjusted_bpm(players, []) == pytest.approx(3.5)
+
     def test_bpm_differential(self):
         """Test BPM differential calculation."""
         result = calculate_bpm_differential(
@@ -169,8 +278,8 @@ class TestPlayerImpact:
             home_top_5_bpm=5.0,
             away_top_5_bpm=3.0,
         )
-        assert result["bpm_diff"] == 2.0
-        assert result["top_5_bpm_diff"] == 2.0
+        assert result.bpm_diff == 2.0
+        assert result.top_5_bpm_diff == 2.0
 
 
 class TestLineMovement:
@@ -180,11 +289,13 @@ class TestLineMovement:
         movement = calculate_spread_movement(opening_spread=-3.0, closing_spread=-5.0)
         assert movement == -2.0  # Negative = moved toward home
 
-    def test_movement_classification(self):
+    @pytest.mark.parametrize(
+        "movement,expected",
+        [(-1.5, "sharp_home"), (1.5, "sharp_away"), (0.5, "stable")],
+    )
+    def test_movement_classification(self, movement, expected):
         """Test line movement classification."""
-        assert classify_line_movement(-1.5) == "sharp_home"
-        assert classify_line_movement(1.5) == "sharp_away"
-        assert classify_line_movement(0.5) == "stable"
+        assert classify_line_movement(movement) == expected
 
     def test_line_movement_features(self):
         """Test full line movement features."""
@@ -192,9 +303,66 @@ class TestLineMovement:
             opening_spread=-3.0,
             current_spread=-4.5,
         )
-        assert result["spread_movement"] == -1.5
-        assert result["spread_direction"] == "sharp_home"
-        assert result["implied_prob_shift"] > 0  # Home more likely
+        assert result.spread_movement == -1.5
+        assert result.spread_direction == "sharp_home"
+        assert result.implied_prob_shift > 0  # Home more likely
+
+    def test_line_movement_features_vec_matches_scalar(self):
+        """Vectorized features agree with the scalar version, including missing lines."""
+        nan = np.nan
+        games = [(-3.0, -4.5, 220.0, 223.5), (2.0, 1.5, 210.0, 209.0), (nan, -2.0, nan, 215.0)]
+        opening, current, opening_total, current_total = (np.array(col) for col in zip(*games))
+        result = calculate_line_movement_features_vec(
+            opening, current, opening_total, current_total
+        )
+
+        for i, game in enumerate(games):
+            scalar = calculate_line_movement_features(
+                *(None if np.isnan(value) else value for value in game)
+            )
+            for key, value in scalar._asdict().items():
+                if key == "spread_direction":
+                    assert SPREAD_DIRECTIONS[result[key][i]] == value
+                else:
+                    assert result[key][i] == pytest.approx(value)
+
+    def test_line_movement_features_vec_float32(self):
+        """None/Decimal lines ingest as float32 NaN and stay float32 through the batch path."""
+        from decimal import Decimal
+
+        opening = lines_to_array([Decimal("-3.0"), 2.0, None])
+        current = lines_to_array([-4.5, Decimal("1.5"), -2.0])
+        assert opening.dtype == np.float32 and np.isnan(opening[2])
+
+        result = calculate_line_movement_features_vec(opening, current)
+        assert result["spread_movement"].dtype == np.float32
+        assert result["spread_movement"].tolist() == pytest.approx([-1.5, -0.5, 0.0])
+        assert result["total_movement"].tolist() == [0.0, 0.0, 0.0]
+
+
+class TestProbCache:
+    def test_prob_cache_stores_hot_keys(self):
+        """A repeatedly requested key gets cached after a few misses."""
+        cache = ProbCache(p=0.3)
+        calls = []
+
+        def compute():
+            calls.append(1)
+            return calculate_line_movement_features(-3.0, -4.5)
+
+        results = [cache.get_or_compute("g1", compute) for _ in range(10)]
+        assert len(calls) == 4  # stored on the 4th miss (0.3 * 4 >= 1)
+        assert all(r == results[0] for r in results)
+
+    def test_prob_cache_evicts_oldest_when_full(self):
+        """A full cache drops its oldest entry to store a new one."""
+        cache = ProbCache(p=1.0, max_size=2)
+        for key in ("g1", "g2", "g3"):
+            cache.get_or_compute(key, lambda: key)
+
+        assert len(cache) == 2
+        assert cache.get_or_compute("g1", lambda: "recomputed") == "recomputed"
+        assert cache.get_or_compute("g3", lambda: "recomputed") == "g3"
 
 
 if __name__ == "__main__":
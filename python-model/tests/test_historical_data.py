@@ -0,0 +1,46 @@
+"""
+Tests for packing historical games into structured arrays.
+"""
+import numpy as np
+
+from training.historical_data import (
+    FEATURE_COLUMNS,
+    HistoricalDataLoader,
+    load_sample_data,
+    to_game_records,
+)
+
+
+class TestGameRecords:
+    def test_load_games_frame_round_trips(self):
+        """Full team names and long game IDs survive packing untruncated."""
+        df = HistoricalDataLoader()._calculate_features(load_sample_data().iloc[:4])
+        # Shaped like load_games: team columns hold full names, IDs are cuids
+        df["home_team_id"] = ["Los Angeles Lakers", "Portland Trail Blazers", "Boston Celtics", "Miami Heat"]
+        df["away_team_id"] = ["Los Angeles Clippers", "Utah Jazz", "Golden State Warriors", "New York Knicks"]
+        df["game_id"] = [f"clx{i:0>40}" for i in range(4)]
+
+        records = to_game_records(df)
+
+        for name in ("game_id", "home_team_id", "away_team_id"):
+            assert records[name].tolist() == df[name].tolist()
+        assert records["game_date"].tolist() == df["game_date"].dt.date.tolist()
+        assert records["home_won"].tolist() == df["home_won"].astype(bool).tolist()
+        for name in FEATURE_COLUMNS:
+            np.testing.assert_array_equal(records[name], df[name].to_numpy(dtype=np.float64))
+
+    def test_empty_frame(self):
+        df = HistoricalDataLoader()._calculate_features(load_sample_data().iloc[:4]).iloc[:0]
+        assert len(to_game_records(df)) == 0
+
+
+class TestSplits:
+    def test_chronological_split_holds_out_latest_games(self):
+        loader = HistoricalDataLoader()
+        df = loader._calculate_features(load_sample_data()).sample(frac=1.0, random_state=0)
+
+        X_train, X_test, y_train, y_test = loader.prepare_chronological_split(df, test_size=0.2)
+
+        assert len(X_test) == 200 and len(X_train) == len(df) - 200
+        assert df.loc[X_train.index, "game_date"].max() < df.loc[X_test.index, "game_date"].min()
+        assert (y_test.index == X_test.index).all()
@@ -0,0 +1,45 @@
+"""
+Tests for model loading and metadata caching.
+"""
+import json
+import os
+
+import numpy as np
+import xgboost as xgb
+
+from app.models.model_loader import get_model_info, load_model, save_model
+from app.models.xgboost_model import FEATURE_ORDER
+
+OLD_NAMES = list(FEATURE_ORDER[:3])
+NEW_NAMES = OLD_NAMES[::-1]
+
+
+def _tiny_booster() -> xgb.Booster:
+    rng = np.random.default_rng(0)
+    X = rng.random((32, 3), dtype=np.float32)
+    y = (X[:, 0] > 0.5).astype(np.float32)
+    return xgb.train({"objective": "binary:logistic"}, xgb.DMatrix(X, label=y), num_boost_round=2)
+
+
+class TestModelLoader:
+    def test_reloads_when_sidecar_changes(self, tmp_path):
+        model_path = str(tmp_path / "model.ubj")
+        save_model(_tiny_booster(), model_path, feature_names=OLD_NAMES)
+        assert load_model(model_path).metadata["feature_names"] == OLD_NAMES
+
+        # Rewrite only the sidecar, as a load racing save_model would see it
+        metadata_path = str(tmp_path / "model_metadata.json")
+        with open(metadata_path, "w") as f:
+            json.dump({"feature_names": NEW_NAMES}, f)
+        stat = os.stat(metadata_path)
+        os.utime(metadata_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        assert load_model(model_path).metadata["feature_names"] == NEW_NAMES
+        assert get_model_info(model_path)["metadata"]["feature_names"] == NEW_NAMES
+
+    def test_model_info_returns_copy(self, tmp_path):
+        model_path = str(tmp_path / "model.ubj")
+        save_model(_tiny_booster(), model_path, feature_names=OLD_NAMES)
+
+        get_model_info(model_path)["metadata"]["feature_names"].append("extra")
+        assert get_model_info(model_path)["metadata"]["feature_names"] == OLD_NAMES
@@ -0,0 +1,104 @@
+"""
+Tests for prediction request feature building.
+"""
+import os
+
+import numpy as np
+import pytest
+
+from app.api.routes.predictions import (
+    PredictionRequest,
+    build_feature_matrix,
+    build_feature_vector,
+)
+from app.models.model_loader import load_model
+
+SHIPPED_MODEL = os.path.join(os.path.dirname(__file__), "..", "models", "xgb_nba_v1.ubj")
+
+# home_win_prob from the shipped model for _random_request(default_rng(11), 0..11).
+# Feature changes that move these need a deliberate update (and a retrain
+# if the model should see the new values).
+SHIPPED_MODEL_PROBS = [
+    0.7855, 0.9021, 0.7891, 0.2921, 0.3164, 0.9229,
+    0.4615, 0.308, 0.5884, 0.4896, 0.8368, 0.2156,
+]
+
+OPTIONAL_TEAM_FIELDS = ("adj_off_rating", "adj_def_rating", "adj_net_rating", "team_bpm", "top_5_bpm")
+OPTIONAL_GAME_FIELDS = (
+    "opening_spread",
+    "current_spread",
+    "home_sos_ortg",
+    "home_sos_drtg",
+    "away_sos_ortg",
+    "away_sos_drtg",
+)
+
+
+def _random_team(rng, abbr: str) -> dict:
+    ortg, drtg = rng.normal(112, 4, size=2)
+    team = {
+        "team_id": abbr,
+        "team_name": abbr,
+        "off_rating": ortg,
+        "def_rating": drtg,
+        "net_rating": ortg - drtg,
+        "pace": rng.normal(99, 3),
+        "efg_pct": rng.uniform(0.48, 0.58),
+        "tov_pct": rng.uniform(0.10, 0.16),
+        "oreb_pct": rng.uniform(0.20, 0.32),
+        "ftr": rng.uniform(0.18, 0.30),
+        "opp_efg_pct": rng.uniform(0.48, 0.58),
+        "opp_tov_pct": rng.uniform(0.10, 0.16),
+        "opp_oreb_pct": rng.uniform(0.20, 0.32),
+        "opp_ftr": rng.uniform(0.18, 0.30),
+        "adj_off_rating": ortg + rng.normal(0, 1),
+        "adj_def_rating": drtg + rng.normal(0, 1),
+        "adj_net_rating": rng.normal(0, 5),
+        "team_bpm": rng.normal(0, 3),
+        "top_5_bpm": rng.normal(5, 3),
+    }
+    for field in OPTIONAL_TEAM_FIELDS:
+        if rng.random() < 0.3:
+            del team[field]
+    return team
+
+
+def _random_request(rng, i: int) -> PredictionRequest:
+    game = {
+        "game_id": f"g{i}",
+        "home_team": _random_team(rng, "HOM"),
+        "away_team": _random_team(rng, "AWY"),
+        "opening_spread": rng.normal(0, 6),
+        "current_spread": rng.normal(0, 6),
+        "home_sos_ortg": rng.normal(112, 2),
+        "home_sos_drtg": rng.normal(112, 2),
+        "away_sos_ortg": rng.normal(112, 2),
+        "away_sos_drtg": rng.normal(112, 2),
+    }
+    for field in OPTIONAL_GAME_FIELDS:
+        if rng.random() < 0.3:
+            del game[field]
+    return PredictionRequest(**game)
+
+
+class TestFeatureMatrix:
+    def test_matrix_rows_match_single_game_vectors(self):
+        """Each batch row equals the single-game vector, optional fields missing or not."""
+        rng = np.random.default_rng(7)
+        requests = [_random_request(rng, i) for i in range(200)]
+
+        matrix = build_feature_matrix(requests)
+        for i, request in enumerate(requests):
+            np.testing.assert_array_equal(matrix[i], build_feature_vector(request))
+
+
+class TestShippedModelRegression:
+    def test_shipped_model_probabilities_are_stable(self):
+        """Feature pipeline changes don't silently move the shipped model's output."""
+        rng = np.random.default_rng(11)
+        requests = [_random_request(rng, i) for i in range(len(SHIPPED_MODEL_PROBS))]
+
+        model = load_model(SHIPPED_MODEL)
+        X = np.array([build_feature_vector(request) for request in requests])
+        probs = [p["home_win_prob"] for p in model.predict_from_array(X)]
+        assert probs == pytest.approx(SHIPPED_MODEL_PROBS, abs=1e-4)
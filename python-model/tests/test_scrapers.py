@@ -0,0 +1,191 @@
+"""
+Tests for the Basketball Reference scraper.
+"""
+import asyncio
+import os
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from app.scrapers import basketball_ref, rate_limiter
+from app.scrapers.basketball_ref import (
+    BasketballReferenceScraper,
+    _parse_league_averages,
+    _parse_team_page,
+)
+from app.scrapers.rate_limiter import AsyncRateLimiter
+
+URL = "https://example.com/teams/BOS/2024.html"
+
+
+def _player_row(slug: str, name: str, bpm: str) -> str:
+    """An advanced-table row: player cell, 19 filler cells, then the BPM columns."""
+    filler = "".join(f"<td>{i}</td>" for i in range(1, 20))
+    return (
+        f'<tr><th data-stat="player"><a href="/players/x/{slug}.html">{name}</a></th>{filler}'
+        f'<td data-stat="bpm">{bpm}</td><td data-stat="obpm"><strong>1.5</strong></td>'
+        f'<td data-stat="dbpm">-0.5</td><td data-stat="vorp"></td></tr>'
+    )
+
+
+TEAM_PAGE = (
+    "<html><body><h1> <span>Boston Celtics</span> </h1>"
+    '<table id="advanced"><tbody>'
+    + _player_row("tatumja01", "Jayson Tatum", "5.9")
+    + '<tr class="thead"><th>Player</th></tr>'
+    + _player_row("brownja02", "Jaylen Brown", "-1.2")
+    + "<tr><td>short row</td></tr>"
+    "</tbody></table>"
+    '<div id="all_team_misc"><!-- <table id="team_misc"><tbody><tr>'
+    '<td data-stat="off_rtg">122.2</td><td data-stat="def_rtg">110.6</td>'
+    '<td data-stat="net_rtg">11.6</td><td data-stat="pace">97.2</td>'
+    '<td data-stat="efg_pct">.579</td><td data-stat="opp_efg_pct">.519</td>'
+    "</tr></tbody></table> --></div></body></html>"
+)
+
+LEAGUE_PAGE = (
+    '<html><body><table id="misc_stats"><tfoot>'
+    '<tr><td data-stat="off_rtg">115.3</td><td data-stat="def_rtg">115.3</td>'
+    '<td data-stat="pace">98.5</td></tr>'
+    '<tr><td data-stat="off_rtg">0</td></tr>'
+    "</tfoot></table></body></html>"
+)
+
+
+class TestParsers:
+    def test_parse_team_page(self):
+        players, stats = _parse_team_page(TEAM_PAGE, "BOS", 2024)
+
+        assert [p.player_id for p in players] == ["tatumja01", "brownja02"]
+        tatum = players[0]
+        assert tatum.player_name == "Jayson Tatum"
+        assert (tatum.games_played, tatum.minutes_played) == (2, 3)
+        assert (tatum.bpm, tatum.obpm, tatum.dbpm, tatum.vorp) == (5.9, 1.5, -0.5, 0.0)
+        assert players[1].bpm == -1.2
+
+        assert stats.team_name == "Boston Celtics"
+        assert (stats.off_rating, stats.def_rating, stats.net_rating) == (122.2, 110.6, 11.6)
+        assert (stats.pace, stats.efg_pct, stats.opp_efg_pct) == (97.2, 0.579, 0.519)
+        assert stats.tov_pct == 0.0  # missing cells fall back to 0
+
+    def test_parse_team_page_without_stats(self):
+        players, stats = _parse_team_page("<html><body><p>nothing</p></body></html>", "BOS", 2024)
+        assert players == [] and stats is None
+
+    def test_parse_league_averages(self):
+        assert _parse_league_averages(LEAGUE_PAGE) == {
+            "avg_ortg": 115.3,
+            "avg_drtg": 115.3,
+            "avg_pace": 98.5,
+        }
+
+    def test_parse_league_averages_defaults(self):
+        assert _parse_league_averages("<html><body></body></html>") == {
+            "avg_ortg": 110.0,
+            "avg_drtg": 110.0,
+            "avg_pace": 100.0,
+        }
+
+
+class TestAsyncRateLimiter:
+    @pytest.mark.asyncio
+    async def test_caps_calls_per_window_in_fifo_order(self, monkeypatch):
+        """With a fake clock, no window holds more than `calls` acquisitions."""
+        clock = [1000.0]
+        real_sleep = asyncio.sleep
+
+        async def fake_sleep(delay):
+            clock[0] += delay
+            await real_sleep(0)
+
+        monkeypatch.setattr(rate_limiter, "time", SimpleNamespace(monotonic=lambda: clock[0]))
+        monkeypatch.setattr(rate_limiter.asyncio, "sleep", fake_sleep)
+
+        limiter = AsyncRateLimiter(calls=3, period=10.0)
+        acquired = []
+
+        async def worker(i):
+            async with limiter:
+                acquired.append((i, clock[0]))
+
+        await asyncio.gather(*(worker(i) for i in range(8)))
+
+        assert [i for i, _ in acquired] == list(range(8))
+        times = [t for _, t in acquired]
+        for start in times:
+            assert sum(start <= t < start + 10.0 for t in times) <= 3
+        assert times[3] - times[0] >= 10.0
+
+
+class TestPageCache:
+    def test_round_trip(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(basketball_ref, "CACHE_DIR", str(tmp_path))
+        basketball_ref._write_cached_page(URL, "<html>ok</html>")
+        assert basketball_ref._read_cached_page(URL) == "<html>ok</html>"
+
+    def test_expired_entry_is_a_miss(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(basketball_ref, "CACHE_DIR", str(tmp_path))
+        basketball_ref._write_cached_page(URL, "<html>old</html>")
+        stale = time.time() - basketball_ref.CACHE_TTL - 60
+        os.utime(basketball_ref._cache_path(URL), (stale, stale))
+        assert basketball_ref._read_cached_page(URL) is None
+
+    def test_empty_cache_dir_disables_cache(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setattr(basketball_ref, "CACHE_DIR", "")
+        basketball_ref._write_cached_page(URL, "<html>ok</html>")
+        assert basketball_ref._read_cached_page(URL) is None
+        assert os.listdir(tmp_path) == []
+
+    def test_unwritable_cache_dir_is_logged_not_raised(self, tmp_path, monkeypatch, caplog):
+        blocker = tmp_path / "not_a_dir"
+        blocker.write_text("")
+        monkeypatch.setattr(basketball_ref, "CACHE_DIR", str(blocker))
+        basketball_ref._write_cached_page(URL, "<html>ok</html>")
+        assert basketball_ref._read_cached_page(URL) is None
+        assert "Could not cache page" in caplog.text
+
+
+class TestTeamPageMemo:
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_keeps_shared_fetch(self):
+        scraper = BasketballReferenceScraper()
+        release = asyncio.Event()
+        calls = []
+
+        async def fake_scrape(team_abbr, season):
+            calls.append((team_abbr, season))
+            await release.wait()
+            return [], None
+
+        scraper._scrape_team_page = fake_scrape
+
+        first = asyncio.create_task(scraper.scrape_team_page("BOS", 2024))
+        second = asyncio.create_task(scraper.scrape_team_page("BOS", 2024))
+        await asyncio.sleep(0)
+        first.cancel()
+        await asyncio.sleep(0)
+        release.set()
+
+        assert await second == ([], None)
+        assert first.cancelled()
+        assert calls == [("BOS", 2024)]
+
+    @pytest.mark.asyncio
+    async def test_failed_fetch_is_not_memoized(self):
+        scraper = BasketballReferenceScraper()
+        calls = []
+
+        async def fake_scrape(team_abbr, season):
+            calls.append(team_abbr)
+            if len(calls) == 1:
+                raise RuntimeError("boom")
+            return [], None
+
+        scraper._scrape_team_page = fake_scrape
+
+        with pytest.raises(RuntimeError):
+            await scraper.scrape_team_page("BOS", 2024)
+        assert await scraper.scrape_team_page("BOS", 2024) == ([], None)
+        assert len(calls) == 2
@@ -0,0 +1,43 @@
+"""
+Tests for the XGBoost model wrapper's prediction paths.
+"""
+import numpy as np
+import pytest
+import xgboost as xgb
+
+from app.models.xgboost_model import FEATURE_ORDER, XGBoostNBAModel
+
+
+@pytest.fixture(scope="module")
+def booster() -> xgb.Booster:
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(300, len(FEATURE_ORDER)))
+    y = (X[:, 0] + rng.normal(size=300) > 0).astype(np.float32)
+    dtrain = xgb.DMatrix(X, label=y, feature_names=list(FEATURE_ORDER))
+    return xgb.train({"objective": "binary:logistic", "max_depth": 3}, dtrain, num_boost_round=20)
+
+
+def _random_rows(n: int) -> np.ndarray:
+    """Feature rows in FEATURE_ORDER with about 15% of values missing (NaN)."""
+    rng = np.random.default_rng(1)
+    X = rng.normal(size=(n, len(FEATURE_ORDER)))
+    X[:, FEATURE_ORDER.index("projected_game_pace")] += 100.0
+    X[rng.random(X.shape) < 0.15] = np.nan
+    return X
+
+
+class TestPredictionPaths:
+    @pytest.mark.parametrize("reverse_columns", [False, True])
+    def test_batch_and_array_paths_match_single_game(self, booster, reverse_columns):
+        """Missing features score the same through predict, predict_batch and predict_from_array."""
+        names = FEATURE_ORDER[::-1] if reverse_columns else FEATURE_ORDER
+        model = XGBoostNBAModel(booster, names)
+        X = _random_rows(50)
+        dicts = [
+            {name: None if np.isnan(value) else float(value) for name, value in zip(FEATURE_ORDER, row)}
+            for row in X
+        ]
+
+        single = [model.predict(features) for features in dicts]
+        assert model.predict_batch(dicts) == single
+        assert model.predict_from_array(X) == single
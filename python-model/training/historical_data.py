@@ -3,10 +3,11 @@ Historical data preparation for model training.
 
 Loads and prepares training data from the database.
 """
+import math
 import pandas as pd
 import numpy as np
 from typing import Optional
-from datetime import datetime
+from datetime import date, datetime
 from dataclasses import dataclass
 
 from sqlalchemy import create_engine, text
@@ -15,6 +16,140 @@ from app.config import get_settings
 settings = get_settings()
 
 
+# (feature, minuend, subtrahend) for every plain differential in _calculate_features
+_DIFF_COLUMNS = (
+    ("home_adj_nrtg", "home_adj_ortg", "home_adj_drtg"),
+    ("away_adj_nrtg", "away_adj_ortg", "away_adj_drtg"),
+    ("efg_diff", "home_efg", "away_efg"),
+    ("tov_diff", "away_tov", "home_tov"),  # Lower is better
+    ("oreb_diff", "home_oreb", "away_oreb"),
+    ("ftr_diff", "home_ftr", "away_ftr"),
+    ("def_efg_diff", "away_opp_efg", "home_opp_efg"),
+    ("def_tov_diff", "home_opp_tov", "away_opp_tov"),
+    ("def_oreb_diff", "away_opp_oreb", "home_opp_oreb"),
+    ("def_ftr_diff", "away_opp_ftr", "home_opp_ftr"),
+    ("pace_diff", "home_pace", "away_pace"),
+    ("bpm_diff", "home_bpm", "away_bpm"),
+    ("top_5_bpm_diff", "home_top_5_bpm", "away_top_5_bpm"),
+    ("spread_movement", "closing_spread", "opening_spread"),
+)
+
+# Four factors differentials and their Dean Oliver weights
+_FOUR_FACTOR_COLUMNS = (
+    "efg_diff",
+    "tov_diff",
+    "oreb_diff",
+    "ftr_diff",
+    "def_efg_diff",
+    "def_tov_diff",
+    "def_oreb_diff",
+    "def_ftr_diff",
+)
+_FOUR_FACTOR_WEIGHTS = np.array([0.40, 0.25, 0.20, 0.15, 0.40, 0.25, 0.20, 0.15])
+
+# The four factors are one contiguous block of _DIFF_COLUMNS, so the composite
+# is a dot product over a view of the differential matrix
+_DIFF_NAMES = tuple(name for name, _, _ in _DIFF_COLUMNS)
+_FOUR_FACTOR_BLOCK = slice(
+    _DIFF_NAMES.index(_FOUR_FACTOR_COLUMNS[0]),
+    _DIFF_NAMES.index(_FOUR_FACTOR_COLUMNS[-1]) + 1,
+)
+assert _DIFF_NAMES[_FOUR_FACTOR_BLOCK] == _FOUR_FACTOR_COLUMNS
+
+# Model feature columns, in training order
+FEATURE_COLUMNS = (
+    "adj_nrtg_diff",
+    "home_adj_ortg",
+    "home_adj_drtg",
+    "away_adj_ortg",
+    "away_adj_drtg",
+    "efg_diff",
+    "tov_diff",
+    "oreb_diff",
+    "ftr_diff",
+    "def_efg_diff",
+    "def_tov_diff",
+    "def_oreb_diff",
+    "def_ftr_diff",
+    "four_factors_composite",
+    "pace_diff",
+    "projected_game_pace",
+    "bpm_diff",
+    "top_5_bpm_diff",
+    "spread_movement",
+    "opening_spread",
+)
+
+# Rows fetched per round trip when streaming load_games results
+LOAD_CHUNK_SIZE = 50_000
+
+# Raw columns load_games still returns as-is (model features themselves)
+_SQL_PASSTHROUGH_COLUMNS = (
+    "home_adj_ortg",
+    "home_adj_drtg",
+    "away_adj_ortg",
+    "away_adj_drtg",
+    "opening_spread",
+)
+
+
+def _sql_feature_columns() -> str:
+    """SELECT list of the feature columns, with differentials computed in the database."""
+    diff_sql = {name: f"({a} - {b})" for name, a, b in _DIFF_COLUMNS}
+    composite = " + ".join(
+        f"{weight} * {diff_sql[name]}"
+        for name, weight in zip(_FOUR_FACTOR_COLUMNS, _FOUR_FACTOR_WEIGHTS.tolist())
+    )
+    expressions = {
+        **{name: name for name in _SQL_PASSTHROUGH_COLUMNS},
+        **diff_sql,
+        "four_factors_composite": f"({composite})",
+        "projected_game_pace": "(home_pace + away_pace) / 2",
+    }
+    # COALESCE keeps the result dense, so training can skip fillna
+    return ",\n    ".join(f"COALESCE({expr}, 0) AS {name}" for name, expr in expressions.items())
+
+
+# (column, mean, std) of the normally distributed columns in load_sample_data
+_SAMPLE_NORMAL_COLUMNS = (
+    # Adjusted ratings (around league average of 110)
+    ("home_adj_ortg", 110, 5),
+    ("home_adj_drtg", 110, 5),
+    ("away_adj_ortg", 110, 5),
+    ("away_adj_drtg", 110, 5),
+    # Pace (around league average of 100)
+    ("home_pace", 100, 3),
+    ("away_pace", 100, 3),
+    # Four factors (typical ranges)
+    ("home_efg", 0.52, 0.02),
+    ("home_tov", 0.14, 0.02),
+    ("home_oreb", 0.25, 0.03),
+    ("home_ftr", 0.25, 0.05),
+    ("home_opp_efg", 0.52, 0.02),
+    ("home_opp_tov", 0.14, 0.02),
+    ("home_opp_oreb", 0.25, 0.03),
+    ("home_opp_ftr", 0.25, 0.05),
+    ("away_efg", 0.52, 0.02),
+    ("away_tov", 0.14, 0.02),
+    ("away_oreb", 0.25, 0.03),
+    ("away_ftr", 0.25, 0.05),
+    ("away_opp_efg", 0.52, 0.02),
+    ("away_opp_tov", 0.14, 0.02),
+    ("away_opp_oreb", 0.25, 0.03),
+    ("away_opp_ftr", 0.25, 0.05),
+    # BPM
+    ("home_bpm", 0, 2),
+    ("home_top_5_bpm", 2, 3),
+    ("away_bpm", 0, 2),
+    ("away_top_5_bpm", 2, 3),
+    # Line data
+    ("opening_spread", 0, 5),
+)
+
+# Std of the game margin noise and of each team's score noise in load_sample_data
+_SAMPLE_SCORE_NOISE = np.array([[10.0], [5.0], [5.0]])
+
+
 @dataclass
 class GameRecord:
     """A single game record for training."""
@@ -50,6 +185,54 @@ class GameRecord:
     opening_spread: float
 
 
+# GameRecord as a fixed-size structured dtype, for holding many games in one
+# contiguous array rather than one Python object per game. String fields are
+# listed as "U" and sized from the data by to_game_records (team IDs are full
+# names like "Portland Trail Blazers", so no fixed width is safe)
+GAME_RECORD_DTYPE = np.dtype(
+    [
+        ("game_id", "U"),
+        ("game_date", "M8[D]"),
+        ("home_team_id", "U"),
+        ("away_team_id", "U"),
+        ("home_score", "i2"),
+        ("away_score", "i2"),
+        ("home_won", "?"),
+        *((name, "f8") for name in FEATURE_COLUMNS),
+    ]
+)
+
+
+def to_game_records(df: pd.DataFrame) -> np.ndarray:
+    """
+    Pack a featured games frame into a GAME_RECORD_DTYPE structured array.
+
+    String fields are sized to the longest value in df, so nothing is truncated.
+
+    Args:
+        df: DataFrame from load_games or _calculate_features
+
+    Returns:
+        Structured array with one record per game; fields are accessed as
+        columns (e.g. records["adj_nrtg_diff"])
+    """
+    columns = {}
+    fields = []
+    for name in GAME_RECORD_DTYPE.names:
+        values = df[name]
+        dtype = GAME_RECORD_DTYPE[name]
+        if dtype.kind == "U":
+            values = values.astype(str)  # Team IDs may be ints in sample data
+            dtype = f"U{max(1, int(values.str.len().max())) if len(values) else 1}"
+        columns[name] = values.to_numpy()
+        fields.append((name, dtype))
+
+    records = np.empty(len(df), dtype=fields)
+    for name, values in columns.items():
+        records[name] = values
+    return records
+
+
 class HistoricalDataLoader:
     """Loads historical game data for training."""
 
@@ -77,14 +260,19 @@ class HistoricalDataLoader:
         start_date: str = "2019-10-01",
         end_date: str = None,
         min_games_played: int = 10,
+        chunksize: int = LOAD_CHUNK_SIZE,
     ) -> pd.DataFrame:
         """
         Load historical games with all features.
 
+        Rows are streamed from a server-side cursor in chunks, so peak memory
+        stays near one chunk of Python row objects plus the final frame.
+
         Args:
             start_date: Start of date range
             end_date: End of date range (default: today)
             min_games_played: Minimum games for team stats to be valid
+            chunksize: Rows fetched and converted per chunk
 
         Returns:
             DataFrame with game features and outcomes
@@ -92,10 +280,12 @@ class HistoricalDataLoader:
         if not self.engine:
             self.connect()
 
-        end_date = end_date or datetime.now().strftime("%Y-%m-%d")
+        end_date = end_date or date.today().isoformat()
 
-        # Query to get games with team stats
-        query = text("""
+        # Query to get games with team stats; differentials are computed in
+        # the outer SELECT so only one column per feature crosses the wire
+        query = text(f"""
+            WITH raw AS (
             SELECT
                 g.id as game_id,
                 g.game_date,
@@ -148,97 +338,90 @@ class HistoricalDataLoader:
               AND g.status = 'FINAL'
               AND g.home_score IS NOT NULL
               AND g.away_score IS NOT NULL
-            ORDER BY g.game_date
+            )
+            SELECT
+                game_id,
+                game_date,
+                home_team_id,
+                away_team_id,
+                home_score,
+                away_score,
+                status,
+                {_sql_feature_columns()}
+            FROM raw
+            ORDER BY game_date
         """)
 
-        df = pd.read_sql(
-            query,
-            self.engine,
-            params={"start_date": start_date, "end_date": end_date},
-        )
-
-        # Calculate derived features
-        df = self._calculate_features(df)
-
-        return df
+        with self.engine.connect() as conn:
+            conn = conn.execution_options(stream_results=True)
+            chunks = [
+                # Calculate derived features chunk by chunk
+                self._calculate_features(chunk)
+                for chunk in pd.read_sql(
+                    query,
+                    conn,
+                    params={"start_date": start_date, "end_date": end_date},
+                    chunksize=chunksize,
+                )
+            ]
+
+        # read_sql yields one empty chunk for an empty result, so this never
+        # concatenates an empty list
+        return pd.concat(chunks, ignore_index=True)
 
     def _calculate_features(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Calculate all model features from raw stats."""
-        # Target variable
-        df["home_won"] = (df["home_score"] > df["away_score"]).astype(int)
-
-        # Adjusted net rating differential
-        df["home_adj_nrtg"] = df["home_adj_ortg"] - df["home_adj_drtg"]
-        df["away_adj_nrtg"] = df["away_adj_ortg"] - df["away_adj_drtg"]
-        df["adj_nrtg_diff"] = df["home_adj_nrtg"] - df["away_adj_nrtg"] + 3.5  # Home court
-
-        # Four factors differentials
-        df["efg_diff"] = df["home_efg"] - df["away_efg"]
-        df["tov_diff"] = df["away_tov"] - df["home_tov"]  # Lower is better
-        df["oreb_diff"] = df["home_oreb"] - df["away_oreb"]
-        df["ftr_diff"] = df["home_ftr"] - df["away_ftr"]
-
-        # Defensive four factors
-        df["def_efg_diff"] = df["away_opp_efg"] - df["home_opp_efg"]
-        df["def_tov_diff"] = df["home_opp_tov"] - df["away_opp_tov"]
-        df["def_oreb_diff"] = df["away_opp_oreb"] - df["home_opp_oreb"]
-        df["def_ftr_diff"] = df["away_opp_ftr"] - df["home_opp_ftr"]
+        """
+        Calculate all model features from raw stats.
 
-        # Four factors composite (using Dean Oliver weights)
-        df["four_factors_composite"] = (
-            0.40 * df["efg_diff"]
-            + 0.25 * df["tov_diff"]
-            + 0.20 * df["oreb_diff"]
-            + 0.15 * df["ftr_diff"]
-            + 0.40 * df["def_efg_diff"]
-            + 0.25 * df["def_tov_diff"]
-            + 0.20 * df["def_oreb_diff"]
-            + 0.15 * df["def_ftr_diff"]
+        Frames from load_games already carry the SQL-derived differentials,
+        so only the target and adj_nrtg_diff are added; raw frames (e.g.
+        load_sample_data) get every feature computed here.
+        """
+        # Raw operands present (sample data, or a re-run): derive everything
+        derived = self._derive_raw_features(df) if "home_efg" in df else {}
+        home_nrtg = derived.get("home_adj_nrtg", df.get("home_adj_nrtg"))
+        away_nrtg = derived.get("away_adj_nrtg", df.get("away_adj_nrtg"))
+
+        new = pd.DataFrame(
+            {
+                # Target variable
+                "home_won": (df["home_score"].to_numpy() > df["away_score"].to_numpy()).astype(np.int8),
+                # Adjusted net rating differential
+                "adj_nrtg_diff": np.asarray(home_nrtg) - np.asarray(away_nrtg) + 3.5,  # Home court
+                **derived,
+            },
+            index=df.index,
         )
 
-        # Pace metrics
-        df["pace_diff"] = df["home_pace"] - df["away_pace"]
-        df["projected_game_pace"] = (df["home_pace"] + df["away_pace"]) / 2
-
-        # BPM differentials
-        df["bpm_diff"] = df["home_bpm"] - df["away_bpm"]
-        df["top_5_bpm_diff"] = df["home_top_5_bpm"] - df["away_top_5_bpm"]
+        # One concat instead of ~20 column inserts (re-running replaces the columns)
+        return pd.concat([df.drop(columns=new.columns, errors="ignore"), new], axis=1)
 
-        # Line movement
-        df["spread_movement"] = df["closing_spread"] - df["opening_spread"]
+    @staticmethod
+    def _derive_raw_features(df: pd.DataFrame) -> dict[str, np.ndarray]:
+        """Differentials, composite and projected pace from raw team stats."""
+        # Every differential in one vectorized subtraction over stacked columns
+        minuend = df[[a for _, a, _ in _DIFF_COLUMNS]].to_numpy(dtype=np.float64)
+        subtrahend = df[[b for _, _, b in _DIFF_COLUMNS]].to_numpy(dtype=np.float64)
+        diffs = minuend - subtrahend
+        features = dict(zip(_DIFF_NAMES, diffs.T))
 
-        return df
+        # Four factors composite (using Dean Oliver weights)
+        features["four_factors_composite"] = diffs[:, _FOUR_FACTOR_BLOCK] @ _FOUR_FACTOR_WEIGHTS
+        features["projected_game_pace"] = (
+            df["home_pace"].to_numpy(dtype=np.float64) + df["away_pace"].to_numpy(dtype=np.float64)
+        ) / 2
+        return features
 
     def get_feature_columns(self) -> list[str]:
         """Get list of feature column names."""
-        return [
-            "adj_nrtg_diff",
-            "home_adj_ortg",
-            "home_adj_drtg",
-            "away_adj_ortg",
-            "away_adj_drtg",
-            "efg_diff",
-            "tov_diff",
-            "oreb_diff",
-            "ftr_diff",
-            "def_efg_diff",
-            "def_tov_diff",
-            "def_oreb_diff",
-            "def_ftr_diff",
-            "four_factors_composite",
-            "pace_diff",
-            "projected_game_pace",
-            "bpm_diff",
-            "top_5_bpm_diff",
-            "spread_movement",
-            "opening_spread",
-        ]
+        return list(FEATURE_COLUMNS)
 
     def prepare_training_data(
         self,
         df: pd.DataFrame,
         test_size: float = 0.2,
         random_state: int = 42,
+        assume_no_nan: bool = False,
     ) -> tuple:
         """
         Prepare data for training with train/test split.
@@ -247,29 +430,66 @@ class HistoricalDataLoader:
             df: DataFrame with all features
             test_size: Fraction for test set
             random_state: Random seed
+            assume_no_nan: Skip fillna for frames known to be dense
+                (load_games and load_sample_data output)
 
         Returns:
             Tuple of (X_train, X_test, y_train, y_test)
         """
         from sklearn.model_selection import train_test_split
 
-        feature_cols = self.get_feature_columns()
-
-        X = df[feature_cols].fillna(0)
+        X = df[list(FEATURE_COLUMNS)]
+        if not assume_no_nan:
+            X = X.fillna(0)
         y = df["home_won"]
 
         return train_test_split(X, y, test_size=test_size, random_state=random_state)
 
+    def prepare_chronological_split(
+        self,
+        df: pd.DataFrame,
+        test_size: float = 0.2,
+        assume_no_nan: bool = False,
+    ) -> tuple:
+        """
+        Prepare data for training with the most recent games held out for testing.
+
+        Unlike prepare_training_data's shuffled split, the test set stays
+        disjoint from anything trained on earlier data, so it suits warm
+        starts from a previously trained model.
+
+        Args:
+            df: DataFrame with all features and a game_date column
+            test_size: Fraction for test set (the latest games by game_date)
+            assume_no_nan: Skip fillna for frames known to be dense
+                (load_games and load_sample_data output)
+
+        Returns:
+            Tuple of (X_train, X_test, y_train, y_test)
+        """
+        order = np.argsort(df["game_date"].to_numpy(), kind="stable")
+        n_test = math.ceil(test_size * len(df))
+        train_idx, test_idx = order[: len(df) - n_test], order[len(df) - n_test :]
+
+        X = df[list(FEATURE_COLUMNS)]
+        if not assume_no_nan:
+            X = X.fillna(0)
+        y = df["home_won"]
+
+        return X.iloc[train_idx], X.iloc[test_idx], y.iloc[train_idx], y.iloc[test_idx]
+
     def prepare_time_series_split(
         self,
         df: pd.DataFrame,
         n_splits: int = 5,
-    ) -> list[tuple]:
+    ) -> list[tuple[np.ndarray, np.ndarray]]:
         """
         Prepare data using time-series cross-validation.
 
         For sports prediction, we should never train on future data,
-        so we use expanding window validation.
+        so we use expanding window validation. Only positional indices are
+        returned; slice a cached feature array (e.g. X[train_idx]) as needed
+        instead of holding copies of every fold.
 
         Args:
             df: DataFrame with all features (must be sorted by date)
@@ -281,21 +501,45 @@ class HistoricalDataLoader:
         from sklearn.model_selection import TimeSeriesSplit
 
         tscv = TimeSeriesSplit(n_splits=n_splits)
-        feature_cols = self.get_feature_columns()
 
-        X = df[feature_cols].fillna(0)
-        y = df["home_won"]
+        # Splits depend only on the row count
+        return list(tscv.split(np.empty((len(df), 0))))
+
+
+def build_team_pace_lookup(
+    games_df: pd.DataFrame,
+    window: int = 10,
+) -> dict[tuple, float]:
+    """
+    Precompute each team's trailing pace entering every game.
+
+    Uses one grouped pandas rolling mean over the whole log instead of
+    re-averaging each team's recent games per lookup. Only games before
+    game_date are averaged, so the value is safe to use as a feature.
 
-        splits = []
-        for train_idx, test_idx in tscv.split(X):
-            splits.append((
-                X.iloc[train_idx],
-                X.iloc[test_idx],
-                y.iloc[train_idx],
-                y.iloc[test_idx],
-            ))
+    Args:
+        games_df: One row per team-game with 'team_id', 'game_date' and 'pace'
+        window: Number of previous games to average
 
-        return splits
+    Returns:
+        Dictionary mapping (team_id, game_date) -> trailing pace
+        (a team's first game has no entry)
+    """
+    df = games_df.sort_values("game_date", kind="stable")
+    by_team = df.groupby("team_id", sort=False)
+
+    prior_pace = by_team["pace"].shift(1)
+    trailing = (
+        prior_pace.groupby(df["team_id"], sort=False)
+        .rolling(window, min_periods=1)
+        .mean()
+        .reset_index(level=0, drop=True)
+        .reindex(df.index)
+    )
+
+    valid = trailing.notna()
+    keys = zip(df.loc[valid, "team_id"].tolist(), df.loc[valid, "game_date"].tolist())
+    return dict(zip(keys, trailing[valid].tolist()))
 
 
 def load_sample_data() -> pd.DataFrame:
@@ -305,74 +549,48 @@ def load_sample_data() -> pd.DataFrame:
     Returns:
         DataFrame with synthetic game data
     """
-    np.random.seed(42)
+    rng = np.random.default_rng(42)
     n_games = 1000
 
-    # Generate synthetic features
-    data = {
-        "game_id": [f"game_{i}" for i in range(n_games)],
-        "game_date": pd.date_range("2023-10-01", periods=n_games, freq="D"),
-        "home_team_id": np.random.choice(30, n_games),
-        "away_team_id": np.random.choice(30, n_games),
-
-        # Adjusted ratings (around league average of 110)
-        "home_adj_ortg": np.random.normal(110, 5, n_games),
-        "home_adj_drtg": np.random.normal(110, 5, n_games),
-        "away_adj_ortg": np.random.normal(110, 5, n_games),
-        "away_adj_drtg": np.random.normal(110, 5, n_games),
-
-        # Pace (around league average of 100)
-        "home_pace": np.random.normal(100, 3, n_games),
-        "away_pace": np.random.normal(100, 3, n_games),
-
-        # Four factors (typical ranges)
-        "home_efg": np.random.normal(0.52, 0.02, n_games),
-        "home_tov": np.random.normal(0.14, 0.02, n_games),
-        "home_oreb": np.random.normal(0.25, 0.03, n_games),
-        "home_ftr": np.random.normal(0.25, 0.05, n_games),
-        "home_opp_efg": np.random.normal(0.52, 0.02, n_games),
-        "home_opp_tov": np.random.normal(0.14, 0.02, n_games),
-        "home_opp_oreb": np.random.normal(0.25, 0.03, n_games),
-        "home_opp_ftr": np.random.normal(0.25, 0.05, n_games),
-
-        "away_efg": np.random.normal(0.52, 0.02, n_games),
-        "away_tov": np.random.normal(0.14, 0.02, n_games),
-        "away_oreb": np.random.normal(0.25, 0.03, n_games),
-        "away_ftr": np.random.normal(0.25, 0.05, n_games),
-        "away_opp_efg": np.random.normal(0.52, 0.02, n_games),
-        "away_opp_tov": np.random.normal(0.14, 0.02, n_games),
-        "away_opp_oreb": np.random.normal(0.25, 0.03, n_games),
-        "away_opp_ftr": np.random.normal(0.25, 0.05, n_games),
-
-        # BPM
-        "home_bpm": np.random.normal(0, 2, n_games),
-        "home_top_5_bpm": np.random.normal(2, 3, n_games),
-        "away_bpm": np.random.normal(0, 2, n_games),
-        "away_top_5_bpm": np.random.normal(2, 3, n_games),
-
-        # Line data
-        "opening_spread": np.random.normal(0, 5, n_games),
-    }
+    # All normally distributed columns from one standard-normal draw
+    names = [name for name, _, _ in _SAMPLE_NORMAL_COLUMNS]
+    means = np.array([mean for _, mean, _ in _SAMPLE_NORMAL_COLUMNS])
+    stds = np.array([std for _, _, std in _SAMPLE_NORMAL_COLUMNS])
+    values = means + stds * rng.standard_normal((n_games, len(names)))
 
-    df = pd.DataFrame(data)
+    home_team_id = rng.integers(30, size=n_games)
+    away_team_id = rng.integers(30, size=n_games)
 
     # Calculate closing spread with some movement
-    df["closing_spread"] = df["opening_spread"] + np.random.normal(0, 1, n_games)
+    col = {name: i for i, name in enumerate(names)}
+    closing_spread = values[:, col["opening_spread"]] + rng.standard_normal(n_games)
 
     # Generate realistic scores based on features
     home_advantage = 3.5
     rating_diff = (
-        (df["home_adj_ortg"] - df["home_adj_drtg"])
-        - (df["away_adj_ortg"] - df["away_adj_drtg"])
+        (values[:, col["home_adj_ortg"]] - values[:, col["home_adj_drtg"]])
+        - (values[:, col["away_adj_ortg"]] - values[:, col["away_adj_drtg"]])
         + home_advantage
     )
 
-    # Add noise and generate scores
-    noise = np.random.normal(0, 10, n_games)
-    point_diff = rating_diff + noise
+    # Game noise and both teams' score noise in one draw (same stream order
+    # as three separate draws)
+    noise, home_noise, away_noise = _SAMPLE_SCORE_NOISE * rng.standard_normal((3, n_games))
+    half_diff = (rating_diff + noise) / 2
 
     avg_score = 110
-    df["home_score"] = (avg_score + point_diff / 2 + np.random.normal(0, 5, n_games)).astype(int)
-    df["away_score"] = (avg_score - point_diff / 2 + np.random.normal(0, 5, n_games)).astype(int)
 
-    return df
+    # Every column is ready, so the frame is built once
+    return pd.DataFrame(
+        {
+            "game_id": [f"game_{i}" for i in range(n_games)],
+            "game_date": pd.date_range("2023-10-01", periods=n_games, freq="D"),
+            "home_team_id": home_team_id,
+            "away_team_id": away_team_id,
+            **dict(zip(names, values.T)),
+            "closing_spread": closing_spread,
+            "home_score": (avg_score + half_diff + home_noise).astype(int),
+            "away_score": (avg_score - half_diff + away_noise).astype(int),
+        },
+        copy=False,
+    )
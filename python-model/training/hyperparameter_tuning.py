@@ -5,19 +5,44 @@ Usage:
     python -m training.hyperparameter_tuning --n-trials 100
 """
 import argparse
-from datetime import datetime
+import hashlib
+import os
+import sys
+from datetime import datetime, timezone
 
 import optuna
+from optuna.pruners import MedianPruner
 from optuna.samplers import TPESampler
 import xgboost as xgb
 import numpy as np
 from sklearn.metrics import log_loss, accuracy_score
 from sklearn.model_selection import TimeSeriesSplit
 
-from training.historical_data import HistoricalDataLoader, load_sample_data
+from training.historical_data import FEATURE_COLUMNS, HistoricalDataLoader, load_sample_data
 
+# XGBoost threads per trial; concurrent trials fill the remaining cores
+XGB_THREADS_PER_TRIAL = 4
 
-def create_objective(X, y, n_splits: int = 5):
+# Study persisted here by the CLI with --resume, so an interrupted run resumes
+DEFAULT_STORAGE = "sqlite:///training/optuna_study.db"
+STUDY_NAME = "xgboost_nba_tuning"
+
+
+def _data_fingerprint(X, y) -> str:
+    """Short hash of the training data, so a stored study only resumes on the same data."""
+    digest = hashlib.sha256()
+    digest.update(np.ascontiguousarray(X, dtype=np.float64).tobytes())
+    digest.update(np.ascontiguousarray(y, dtype=np.float64).tobytes())
+    return digest.hexdigest()[:12]
+
+
+def create_objective(
+    X,
+    y,
+    n_splits: int = 5,
+    nthread: int = XGB_THREADS_PER_TRIAL,
+    device: str = "cpu",
+):
     """
     Create an Optuna objective function for XGBoost tuning.
 
@@ -28,12 +53,25 @@ def create_objective(X, y, n_splits: int = 5):
         X: Feature DataFrame
         y: Target Series
         n_splits: Number of CV splits
+        nthread: XGBoost threads per trial
+        device: XGBoost device to train on ("cpu", "cuda", "cuda:<ordinal>")
 
     Returns:
         Objective function for Optuna
     """
     tscv = TimeSeriesSplit(n_splits=n_splits)
 
+    # Build every fold's matrices once; trials only differ in params.
+    # XGBoost works in float32 internally, so convert up front.
+    X_values = X.to_numpy(dtype=np.float32)
+    y_values = y.to_numpy(dtype=np.float32)
+    folds = []
+    for train_idx, val_idx in tscv.split(X_values):
+        # Pre-binned matrices; validation reuses the training bin edges
+        dtrain = xgb.QuantileDMatrix(X_values[train_idx], label=y_values[train_idx], max_bin=256)
+        dval = xgb.QuantileDMatrix(X_values[val_idx], label=y_values[val_idx], ref=dtrain)
+        folds.append((dtrain, dval, y_values[val_idx]))
+
     def objective(trial: optuna.Trial) -> float:
         # Suggest hyperparameters
         params = {
@@ -48,17 +86,14 @@ def create_objective(X, y, n_splits: int = 5):
             "reg_alpha": trial.suggest_float("reg_alpha", 0, 1.0),
             "reg_lambda": trial.suggest_float("reg_lambda", 0.5, 2.0),
             "seed": 42,
+            "nthread": nthread,
+            "tree_method": "hist",
+            "device": device,
         }
 
         cv_scores = []
 
-        for train_idx, val_idx in tscv.split(X):
-            X_train, X_val = X.iloc[train_idx], X.iloc[val_idx]
-            y_train, y_val = y.iloc[train_idx], y.iloc[val_idx]
-
-            dtrain = xgb.DMatrix(X_train, label=y_train)
-            dval = xgb.DMatrix(X_val, label=y_val)
-
+        for fold, (dtrain, dval, y_val) in enumerate(folds):
             # Train with early stopping
             model = xgb.train(
                 params,
@@ -69,11 +104,16 @@ def create_objective(X, y, n_splits: int = 5):
                 verbose_eval=False,
             )
 
-            # Evaluate
-            y_prob = model.predict(dval)
+            # Evaluate with the trees up to the best round only
+            y_prob = model.predict(dval, iteration_range=(0, model.best_iteration + 1))
             score = log_loss(y_val, y_prob)
             cv_scores.append(score)
 
+            # Stop configs that are already worse than the median trial at this fold
+            trial.report(np.mean(cv_scores), step=fold)
+            if trial.should_prune():
+                raise optuna.TrialPruned()
+
         return np.mean(cv_scores)
 
     return objective
@@ -85,6 +125,9 @@ def tune_hyperparameters(
     n_trials: int = 100,
     n_splits: int = 5,
     timeout: int = None,
+    n_jobs: int = None,
+    storage: str = None,
+    device: str = "cpu",
 ) -> dict:
     """
     Tune XGBoost hyperparameters using Optuna.
@@ -95,26 +138,47 @@ def tune_hyperparameters(
         n_trials: Number of optimization trials
         n_splits: Number of CV splits
         timeout: Maximum time in seconds (optional)
+        n_jobs: Concurrent trials (default: CPU count / XGB_THREADS_PER_TRIAL)
+        storage: Optuna storage URL; an existing study there for the same
+            data is resumed and only its remaining trials are run
+            (default: in-memory)
+        device: XGBoost device for every trial's training
 
     Returns:
         Best hyperparameters
     """
-    # Create study
+    # Create study (or load it, to resume an interrupted run). The name carries
+    # a data fingerprint so trials from a different dataset are never mixed in
     study = optuna.create_study(
         direction="minimize",  # Minimize log loss
         sampler=TPESampler(seed=42),
-        study_name="xgboost_nba_tuning",
+        pruner=MedianPruner(n_startup_trials=5),
+        study_name=f"{STUDY_NAME}_{_data_fingerprint(X, y)}",
+        storage=storage,
+        load_if_exists=True,
     )
 
+    finished = study.get_trials(
+        deepcopy=False,
+        states=(optuna.trial.TrialState.COMPLETE, optuna.trial.TrialState.PRUNED),
+    )
+    n_remaining = max(0, n_trials - len(finished))
+    if finished:
+        print(f"Resuming study: {len(finished)} trials done, {n_remaining} to go")
+
+    if n_jobs is None:
+        n_jobs = max(1, (os.cpu_count() or 1) // XGB_THREADS_PER_TRIAL)
+
     # Create objective
-    objective = create_objective(X, y, n_splits)
+    objective = create_objective(X, y, n_splits, device=device)
 
     # Optimize
     study.optimize(
         objective,
-        n_trials=n_trials,
+        n_trials=n_remaining,
         timeout=timeout,
-        show_progress_bar=True,
+        n_jobs=n_jobs,
+        show_progress_bar=sys.stderr.isatty(),  # No redraw noise in CI logs
     )
 
     print("\n" + "=" * 60)
@@ -143,6 +207,29 @@ def main():
         default=None,
         help="Maximum time in seconds",
     )
+    parser.add_argument(
+        "--n-jobs",
+        type=int,
+        default=None,
+        help="Concurrent trials (default: CPU count / XGBoost threads per trial)",
+    )
+    parser.add_argument(
+        "--device",
+        type=str,
+        default="cpu",
+        help='XGBoost training device ("cpu", "cuda", "cuda:<ordinal>")',
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Persist the study to --storage and resume an interrupted run on the same data",
+    )
+    parser.add_argument(
+        "--storage",
+        type=str,
+        default=DEFAULT_STORAGE,
+        help="Optuna storage URL used with --resume",
+    )
     parser.add_argument(
         "--use-sample-data",
         action="store_true",
@@ -174,9 +261,8 @@ def main():
 
     print(f"   Loaded {len(df)} games")
 
-    # Prepare features
-    feature_cols = loader.get_feature_columns()
-    X = df[feature_cols].fillna(0)
+    # Prepare features (both sources are dense: load_games COALESCEs every feature)
+    X = df[list(FEATURE_COLUMNS)]
     y = df["home_won"]
 
     # Run tuning
@@ -185,6 +271,9 @@ def main():
         X, y,
         n_trials=args.n_trials,
         timeout=args.timeout,
+        n_jobs=args.n_jobs,
+        storage=args.storage if args.resume else None,
+        device=args.device,
     )
 
     # Save best parameters
@@ -196,7 +285,7 @@ def main():
 
     output = {
         "best_params": best_params,
-        "tuned_at": datetime.utcnow().isoformat(),
+        "tuned_at": datetime.now(timezone.utc).isoformat(),
         "n_trials": args.n_trials,
         "data_size": len(df),
     }
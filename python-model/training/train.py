@@ -2,19 +2,67 @@
 XGBoost model training script.
 
 Usage:
-    python -m training.train --output models/xgb_nba_v1.json
+    python -m training.train --output models/xgb_nba_v1.ubj
 """
 import argparse
 import json
-from datetime import datetime
+import logging
+from datetime import datetime, timezone
 from pathlib import Path
 
 import numpy as np
+import pandas as pd
 import xgboost as xgb
-from sklearn.metrics import accuracy_score, log_loss, roc_auc_score
+from sklearn.metrics import roc_auc_score
 
 from training.historical_data import HistoricalDataLoader, load_sample_data
-from app.models.model_loader import save_model
+from app.models.model_loader import get_model_info, save_model
+
+logger = logging.getLogger(__name__)
+
+# Boosting rounds between logged evaluation results
+EVAL_LOG_PERIOD = 50
+
+# Confidence levels (predicted probability of the favorite) for calibration buckets
+CALIBRATION_THRESHOLDS = np.array([0.5, 0.55, 0.6, 0.65, 0.7])
+
+# Boosting rounds when continuing from the previously saved model
+WARM_START_ROUNDS = 100
+
+# Probability clip for log loss (float32 eps, as sklearn uses for predict output)
+LOG_LOSS_EPS = float(np.finfo(np.float32).eps)
+
+
+class _LogEvaluation(xgb.callback.TrainingCallback):
+    """Log eval metrics every `period` rounds (and the last round) via logging."""
+
+    def __init__(self, period: int = EVAL_LOG_PERIOD):
+        self.period = period
+        self._last = None
+
+    def _format(self, epoch: int, evals_log: dict) -> str:
+        results = "\t".join(
+            f"{data}-{metric}:{values[-1]:.5f}"
+            for data, metrics in evals_log.items()
+            for metric, values in metrics.items()
+        )
+        return f"[{epoch}]\t{results}"
+
+    def after_iteration(self, model, epoch: int, evals_log: dict) -> bool:
+        if not evals_log:
+            return False
+        if epoch % self.period == 0:
+            logger.info("%s", self._format(epoch, evals_log))
+            self._last = None
+        else:
+            # Formatted lazily: only the final round's line is ever needed
+            self._last = (epoch, evals_log)
+        return False
+
+    def after_training(self, model):
+        if self._last is not None and logger.isEnabledFor(logging.INFO):
+            logger.info("%s", self._format(*self._last))
+        return model
 
 
 def train_model(
@@ -25,18 +73,27 @@ def train_model(
     params: dict = None,
     num_rounds: int = 500,
     early_stopping_rounds: int = 50,
+    device: str = "cpu",
+    xgb_model: xgb.Booster = None,
+    feature_names: list[str] = None,
 ) -> xgb.Booster:
     """
     Train an XGBoost model.
 
     Args:
-        X_train: Training features
-        y_train: Training labels
+        X_train: Training features (2-D array, or a DataFrame)
+        y_train: Training labels; a 2-D array trains one multi-output model
+            whose first column is home win (e.g. [home_won, home_covered])
         X_val: Validation features (optional)
         y_val: Validation labels (optional)
         params: XGBoost parameters
         num_rounds: Maximum training rounds
         early_stopping_rounds: Early stopping patience
+        device: XGBoost device to train on ("cpu", "cuda", "cuda:<ordinal>")
+        xgb_model: Previously trained booster to continue boosting from
+            (num_rounds new trees are added on top of its trees)
+        feature_names: Feature names for both matrices (required for arrays;
+            default: X_train's columns)
 
     Returns:
         Trained XGBoost Booster
@@ -54,28 +111,66 @@ def train_model(
         "reg_alpha": 0.1,
         "reg_lambda": 1.0,
         "seed": 42,
+        "tree_method": "hist",
+        "max_bin": 256,
+        "device": device,
     }
 
+    # Several labels share one ensemble with vector leaves
+    if np.ndim(y_train) == 2 and y_train.shape[1] > 1:
+        default_params["multi_strategy"] = "multi_output_tree"
+        default_params["eval_metric"] = "logloss"  # XGBoost's AUC is single-label only
+
     if params:
         default_params.update(params)
 
-    # Create DMatrix objects
-    dtrain = xgb.DMatrix(X_train, label=y_train, feature_names=list(X_train.columns))
+    feature_names = list(feature_names if feature_names is not None else X_train.columns)
+
+    # XGBoost bins and predicts in float32; as float32 arrays these are
+    # zero-copy views for the matrices below
+    X_train = np.asarray(X_train, dtype=np.float32)
+    y_train = np.asarray(y_train, dtype=np.float32)
+
+    # Pre-binned matrices: quantiles are sketched once at construction
+    dtrain = xgb.QuantileDMatrix(
+        X_train,
+        label=y_train,
+        max_bin=default_params["max_bin"],
+        feature_names=feature_names,
+    )
 
     evals = [(dtrain, "train")]
     if X_val is not None and y_val is not None:
-        dval = xgb.DMatrix(X_val, label=y_val, feature_names=list(X_val.columns))
+        # Validation reuses the training bin edges
+        dval = xgb.QuantileDMatrix(
+            np.asarray(X_val, dtype=np.float32),
+            label=np.asarray(y_val, dtype=np.float32),
+            ref=dtrain,
+            feature_names=feature_names,
+        )
         evals.append((dval, "eval"))
 
+    def _train(params):
+        return xgb.train(
+            params,
+            dtrain,
+            num_boost_round=num_rounds,
+            evals=evals,
+            early_stopping_rounds=early_stopping_rounds if X_val is not None else None,
+            verbose_eval=False,
+            callbacks=[_LogEvaluation()],
+            xgb_model=xgb_model,
+        )
+
     # Train model
-    model = xgb.train(
-        default_params,
-        dtrain,
-        num_boost_round=num_rounds,
-        evals=evals,
-        early_stopping_rounds=early_stopping_rounds if X_val is not None else None,
-        verbose_eval=50,
-    )
+    try:
+        model = _train(default_params)
+    except xgb.core.XGBoostError as e:
+        if default_params["device"] == "cpu":
+            raise
+        # e.g. XGBoost built without CUDA support
+        logger.warning("Device %s unavailable (%s), training on CPU", default_params["device"], e)
+        model = _train({**default_params, "device": "cpu"})
 
     return model
 
@@ -86,41 +181,57 @@ def evaluate_model(model: xgb.Booster, X_test, y_test) -> dict:
 
     Args:
         model: Trained model
-        X_test: Test features
-        y_test: Test labels
+        X_test: Test features (2-D array in training column order, or a DataFrame)
+        y_test: Test labels (home win first, for multi-output models)
 
     Returns:
         Dictionary with evaluation metrics
     """
-    dtest = xgb.DMatrix(X_test, feature_names=list(X_test.columns))
-
-    # Get predictions
-    y_prob = model.predict(dtest)
+    # Get predictions straight from the float32 array, without a DMatrix
+    # (columns are in training order: both splits come from one frame)
+    y_prob = model.inplace_predict(np.asarray(X_test, dtype=np.float32))
+    y_true = np.asarray(y_test)
+    if y_prob.ndim == 2:
+        # Multi-output model: metrics are for the home win head
+        y_prob, y_true = y_prob[:, 0], y_true[:, 0]
     y_pred = (y_prob > 0.5).astype(int)
+    is_correct = y_pred == y_true
+
+    # Calculate metrics (accuracy and log loss in NumPy, skipping sklearn's
+    # input validation; clipped like sklearn's float32 eps)
+    accuracy = float(is_correct.mean())
+    p = np.clip(y_prob.astype(np.float64), LOG_LOSS_EPS, 1 - LOG_LOSS_EPS)
+    logloss = float(-np.mean(np.where(y_true == 1, np.log(p), np.log1p(-p))))
+    auc = roc_auc_score(y_true, y_prob)
+
+    # Calibration by confidence bucket: with games sorted by confidence,
+    # each bucket is a suffix, so one sort and one cumsum cover all of them
+    confidence = np.abs(y_prob - 0.5)
+    order = np.argsort(confidence)
+    sorted_confidence = confidence[order]
+    correct = is_correct[order]
+    # correct_in_top[k] = correct predictions among the k most confident games
+    correct_in_top = np.concatenate(([0], np.cumsum(correct[::-1])))
+
+    counts = len(confidence) - np.searchsorted(
+        sorted_confidence, CALIBRATION_THRESHOLDS - 0.5, side="left"
+    )
 
-    # Calculate metrics
-    accuracy = accuracy_score(y_test, y_pred)
-    logloss = log_loss(y_test, y_prob)
-    auc = roc_auc_score(y_test, y_prob)
-
-    # Calibration by confidence bucket
     buckets = {}
-    for threshold in [0.5, 0.55, 0.6, 0.65, 0.7]:
-        mask = np.abs(y_prob - 0.5) >= (threshold - 0.5)
-        if mask.sum() > 0:
-            bucket_acc = accuracy_score(y_test[mask], y_pred[mask])
+    for threshold, count in zip(CALIBRATION_THRESHOLDS.tolist(), counts.tolist()):
+        if count > 0:
             buckets[f">{threshold:.0%}"] = {
-                "accuracy": bucket_acc,
-                "count": int(mask.sum()),
+                "accuracy": float(correct_in_top[count] / count),
+                "count": count,
             }
 
     return {
         "accuracy": accuracy,
         "log_loss": logloss,
         "auc_roc": auc,
-        "total_games": len(y_test),
+        "total_games": len(y_true),
         "predicted_home_wins": int(y_pred.sum()),
-        "actual_home_wins": int(y_test.sum()),
+        "actual_home_wins": int(y_true.sum()),
         "calibration": buckets,
     }
 
@@ -130,7 +241,7 @@ def main():
     parser.add_argument(
         "--output",
         type=str,
-        default="models/xgb_nba_v1.json",
+        default="models/xgb_nba_v1.ubj",
         help="Output path for trained model",
     )
     parser.add_argument(
@@ -144,6 +255,23 @@ def main():
         default="2019-10-01",
         help="Start date for training data",
     )
+    parser.add_argument(
+        "--device",
+        type=str,
+        default="cpu",
+        help='XGBoost training device ("cpu", "cuda", "cuda:<ordinal>")',
+    )
+    parser.add_argument(
+        "--params",
+        type=str,
+        default=None,
+        help="Tuned parameters JSON from training.hyperparameter_tuning (overrides defaults)",
+    )
+    parser.add_argument(
+        "--warm-start",
+        action="store_true",
+        help=f"Continue from the model at --output if present ({WARM_START_ROUNDS} new rounds)",
+    )
     parser.add_argument(
         "--test-size",
         type=float,
@@ -152,6 +280,9 @@ def main():
     )
     args = parser.parse_args()
 
+    # Boosting progress goes through logging, indented like the step output
+    logging.basicConfig(level=logging.INFO, format="   %(message)s")
+
     print("=" * 60)
     print("XGBoost NBA Prediction Model Training")
     print("=" * 60)
@@ -170,20 +301,69 @@ def main():
 
     print(f"   Loaded {len(df)} games")
 
+    # Previous model to continue boosting from, if requested
+    prior = None
+    prior_trained_through = None
+    num_rounds = 500
+    if args.warm_start and Path(args.output).exists():
+        prior = xgb.Booster()
+        prior.load_model(args.output)
+        prior_info = get_model_info(args.output) or {}
+        prior_trained_through = prior_info.get("metadata", {}).get("trained_through")
+        num_rounds = WARM_START_ROUNDS
+        print(f"   Warm-starting from {args.output} ({prior.num_boosted_rounds()} trees)")
+
     # Prepare data
     print("\n2. Preparing train/test split...")
-    X_train, X_test, y_train, y_test = loader.prepare_training_data(
-        df, test_size=args.test_size
-    )
+    feature_names = loader.get_feature_columns()
+    held_out = True
+    if prior is None:
+        X_train, X_test, y_train, y_test = loader.prepare_training_data(
+            df, test_size=args.test_size, assume_no_nan=True
+        )
+    else:
+        # A shuffled split of the grown frame would put games the prior model
+        # trained on into the test set; test on the latest games instead, which
+        # are only unseen if they postdate everything the prior trained on
+        X_train, X_test, y_train, y_test = loader.prepare_chronological_split(
+            df, test_size=args.test_size, assume_no_nan=True
+        )
+        first_test_date = pd.Timestamp(df.loc[X_test.index, "game_date"].min())
+        held_out = prior_trained_through is not None and first_test_date > pd.Timestamp(
+            prior_trained_through
+        )
+        if not held_out:
+            print(
+                "   WARNING: the prior model may have trained on test games "
+                f"(trained through {prior_trained_through or 'unknown'}); "
+                "metrics are not held out"
+            )
+
+    # Latest game the saved model has trained on, so a later warm start can
+    # hold out only newer games
+    trained_through = pd.Timestamp(df.loc[X_train.index, "game_date"].max())
+    if prior_trained_through is not None:
+        trained_through = max(trained_through, pd.Timestamp(prior_trained_through))
+
+    # Plain float32 arrays from here on; names travel separately
+    X_train, X_test = X_train.to_numpy(np.float32), X_test.to_numpy(np.float32)
+    y_train, y_test = y_train.to_numpy(np.float32), y_test.to_numpy(np.float32)
     print(f"   Training set: {len(X_train)} games")
     print(f"   Test set: {len(X_test)} games")
 
-    # Split training into train/validation
-    from sklearn.model_selection import train_test_split
+    # Split training into train/validation with one shuffled index array
+    idx = np.random.default_rng(42).permutation(len(X_train))
+    cut = int(0.85 * len(X_train))
+    train_idx, val_idx = idx[:cut], idx[cut:]
+    X_train, X_val = X_train[train_idx], X_train[val_idx]
+    y_train, y_val = y_train[train_idx], y_train[val_idx]
 
-    X_train, X_val, y_train, y_val = train_test_split(
-        X_train, y_train, test_size=0.15, random_state=42
-    )
+    # Tuned hyperparameters, if a tuning run's output was given
+    params = None
+    if args.params:
+        with open(args.params) as f:
+            params = json.load(f)["best_params"]
+        print(f"   Using tuned parameters from {args.params}")
 
     # Train model
     print("\n3. Training model...")
@@ -192,15 +372,19 @@ def main():
         y_train,
         X_val,
         y_val,
-        num_rounds=500,
+        params=params,
+        num_rounds=num_rounds,
         early_stopping_rounds=50,
+        device=args.device,
+        xgb_model=prior,
+        feature_names=feature_names,
     )
 
     # Evaluate
     print("\n4. Evaluating model...")
     metrics = evaluate_model(model, X_test, y_test)
 
-    print(f"\n   Results:")
+    print(f"\n   Results:" if held_out else "\n   Results (NOT held out, see warning above):")
     print(f"   - Accuracy: {metrics['accuracy']:.2%}")
     print(f"   - Log Loss: {metrics['log_loss']:.4f}")
     print(f"   - AUC-ROC:  {metrics['auc_roc']:.4f}")
@@ -213,17 +397,19 @@ def main():
     Path(args.output).parent.mkdir(parents=True, exist_ok=True)
 
     metadata = {
-        "trained_at": datetime.utcnow().isoformat(),
+        "trained_at": datetime.now(timezone.utc).isoformat(),
         "training_games": len(X_train) + len(X_val),
         "test_games": len(X_test),
         "metrics": metrics,
+        "metrics_held_out": held_out,
+        "trained_through": trained_through.date().isoformat(),
         "version": "v1.0.0",
     }
 
     save_model(
         model,
         args.output,
-        feature_names=loader.get_feature_columns(),
+        feature_names=feature_names,
         metadata=metadata,
     )
 
@@ -135,7 +135,7 @@ export class XGBoostClient {
     const timeoutId = setTimeout(() => controller.abort(), this.timeout);
 
     try {
-      const response = await fetch(`${this.baseUrl}/predict/`, {
+      const response = await fetch(`${this.baseUrl}/predict/?include_features=true`, {
         method: "POST",
         headers: {
           "Content-Type": "application/json",
@@ -167,7 +167,7 @@ export class XGBoostClient {
     const timeoutId = setTimeout(() => controller.abort(), this.timeout * 2);
 
     try {
-      const response = await fetch(`${this.baseUrl}/predict/batch`, {
+      const response = await fetch(`${this.baseUrl}/predict/batch?include_features=true`, {
         method: "POST",
         headers: {
           "Content-Type": "application/json",